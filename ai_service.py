@@ -1,32 +1,46 @@
+import os
 import random
-import json
-from pathlib import Path
-from typing import Optional, Dict
+from typing import Optional, Dict, Tuple
 
 # ===================== AI MODULES =====================
 
-from model_layer.ai.explanation_generator import generate_explanation
+from model_layer.ai.explanation_generator import (
+    generate_explanation,
+    build_explanation_prompt,
+    ALLOWED_LEVELS,
+    TOPIC_MAP,
+)
+from model_layer.ai import prerendered
 from model_layer.ai.exercise_generator import generate_ai_exercise
 from model_layer.ai.ai_tutor_generator import generate_ai_tutor
-from model_layer.ai.feedback_generator import generate_exercise_feedback
+from model_layer.ai.feedback_cache import get_feedback
 from model_layer.ai.quiz_generator import generate_ai_quiz
-from model_layer.ai.chat_guard import chat_with_topic_guard
+from model_layer.ai.chat_guard import (
+    chat_with_topic_guard,
+    criteria_cache_key,
+    criteria_version,
+)
+from model_layer.ai.rag_store import preload as preload_rag
+from model_layer.ai.admission import (
+    llm_priority,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_EXPLAIN,
+    PRIORITY_BACKGROUND,
+)
 
 # ===================== EVALUATION =====================
 
 from model_layer.evaluation.exercise_evaluator import evaluate_exercise
 from model_layer.evaluation.quiz_evaluator import evaluate_quiz
 
-# ===================== PATHS & DATA =====================
+# ===================== QUESTION BANK =====================
 
-BASE_DIR = Path(__file__).resolve().parent
-DATA_DIR = BASE_DIR / "model_layer" / "data"
+from model_layer.bank.question_bank import load_bank
+from model_layer.bank.sampler import sampler
+from model_layer.serving.fast_json import dumps
+from model_layer.serving.tracing import span, event
 
-with open(DATA_DIR / "exercises.json", encoding="utf-8") as f:
-    EXERCISES = json.load(f)
-
-with open(DATA_DIR / "quizzes.json", encoding="utf-8") as f:
-    QUIZZES = json.load(f)
+BANK = load_bank()
 
 # ===================== MEMORY (LAST FAILED) =====================
 
@@ -35,50 +49,110 @@ LAST_FAILED_EXERCISE: Dict[str, int] = {}
 # ===================== EXPLANATION =====================
 
 def explain_topic(topic: str, level: Optional[str] = None) -> str:
-    return generate_explanation(topic, level or "Beginner")
+    with llm_priority(PRIORITY_EXPLAIN, fallback=True):
+        return generate_explanation(topic, level or "Beginner")
+
+# ===================== BANK PAYLOADS =====================
+
+EMPTY_EXERCISE = {
+    "id": None,
+    "question": "لا توجد تمارين متاحة لهذا الموضوع حالياً.",
+    "instruction": "راجع الشرح ثم أعد المحاولة لاحقًا.",
+    "source": "empty_bank",
+    "counted": False
+}
+
+EMPTY_QUIZ = {
+    "id": None,
+    "question": "لا توجد أسئلة كويز حالياً.",
+    "options": [],
+    "source": "empty_bank"
+}
+
+
+def _exercise_payload(item: Dict) -> Dict:
+    return {
+        "id": item["id"],
+        "question": item["question"],
+        "instruction": "اكتب إجابتك بأسلوبك الخاص، لا تعتمد على الحفظ.",
+        "source": "question_bank",
+        "counted": True
+    }
+
+
+def _quiz_payload(q: Dict) -> Dict:
+    return {
+        "id": q["id"],
+        "question": q["question"],
+        "options": q["options"],
+        # ✅ التعديل هنا
+        "correct_index": q["correct_index"],
+        "correct_answer": q["options"][q["correct_index"]],
+        "source": "question_bank"
+    }
+
+
+def _pick_index(
+    kind: str,
+    topic: str,
+    level: str,
+    count: int,
+    student_id: Optional[str]
+) -> int:
+    # known students walk a shuffled deck: no repeats until all were seen
+    if student_id:
+        return sampler.draw(student_id, kind, topic, level, count)
+    return random.randrange(count)
+
+
+def _pick_exercise(
+    topic: str,
+    level: str,
+    student_id: Optional[str] = None
+) -> Optional[Tuple[str, int]]:
+    bank_level = level if BANK.count("exercise", topic, level) else "Beginner"
+    count = BANK.count("exercise", topic, bank_level)
+    if not count:
+        return None
+    return bank_level, _pick_index("exercise", topic, bank_level, count, student_id)
+
+
+def _pick_quiz(
+    topic: str,
+    level: str,
+    student_id: Optional[str] = None
+) -> Optional[Tuple[str, int]]:
+    count = BANK.count("quiz", topic, level)
+    if not count:
+        return None
+    return level, _pick_index("quiz", topic, level, count, student_id)
 
 # ===================== EXERCISES =====================
 
 def generate_exercise_item(
     topic: str,
     level: Optional[str] = None,
-    use_ai: bool = False
+    use_ai: bool = False,
+    student_id: Optional[str] = None
 ) -> Dict:
     level = level or "Beginner"
 
     if not use_ai:
-        topic_data = EXERCISES.get(topic, {})
-        level_items = topic_data.get(level) or topic_data.get("Beginner", [])
-
-        if level_items:
-            item = random.choice(level_items)
-            return {
-                "id": item["id"],
-                "question": item["question"],
-                "instruction": "اكتب إجابتك بأسلوبك الخاص، لا تعتمد على الحفظ.",
-                "source": "question_bank",
-                "counted": True
-            }
-
-        return {
-            "id": None,
-            "question": "لا توجد تمارين متاحة لهذا الموضوع حالياً.",
-            "instruction": "راجع الشرح ثم أعد المحاولة لاحقًا.",
-            "source": "empty_bank",
-            "counted": False
-        }
+        picked = _pick_exercise(topic, level, student_id)
+        if picked:
+            return _exercise_payload(BANK.item_at("exercise", topic, *picked))
+        return dict(EMPTY_EXERCISE)
 
     last_id = LAST_FAILED_EXERCISE.get(topic)
     focus_points = None
 
     if last_id is not None:
-        for items in EXERCISES.get(topic, {}).values():
-            for it in items:
-                if it["id"] == last_id:
-                    focus_points = it.get("expected_points", [])
-                    break
+        it = BANK.find("exercise", topic, last_id)
+        if it:
+            focus_points = it.get("expected_points", [])
 
-    tutor_text = generate_ai_tutor(topic, level, focus_points)
+    with llm_priority(PRIORITY_BACKGROUND, fallback=True):
+        tutor_text = generate_ai_tutor(topic, level, focus_points)
 
     return {
         "id": None,
@@ -98,66 +172,59 @@ def evaluate_exercise_answer(
     exercise_id: int,
     student_answer: str
 ) -> Dict:
-    for items in EXERCISES.get(topic, {}).values():
-        for item in items:
-            if item["id"] == exercise_id:
-                result = evaluate_exercise(
-                    student_answer,
-                    item.get("expected_points", [])
-                )
-
-                if result["score_5"] < 4:
-                    LAST_FAILED_EXERCISE[topic] = exercise_id
-
-                feedback = generate_exercise_feedback(
-                    student_answer,
-                    result["covered_points"],
-                    result["missing_points"]
-                )
-
-                return {
-                    "score_5": result["score_5"],
-                    "is_correct": result["is_correct"],
-                    "covered_points": result["covered_points"],
-                    "missing_points": result["missing_points"],
-                    "feedback": feedback
-                }
-
-    return {"error": "EXERCISE_NOT_FOUND"}
+    with span("bank.lookup", kind="exercise", id=exercise_id) as s:
+        item = BANK.find("exercise", topic, exercise_id)
+        s.set(found=item is not None)
+    if not item:
+        return {"error": "EXERCISE_NOT_FOUND"}
+
+    with span("exercise.evaluate", answer_chars=len(student_answer)):
+        result = evaluate_exercise(
+            student_answer,
+            item.get("expected_points", [])
+        )
+
+    if result["score_5"] < 4:
+        LAST_FAILED_EXERCISE[topic] = exercise_id
+
+    with llm_priority(PRIORITY_INTERACTIVE, fallback=True):
+        feedback = get_feedback(
+            topic,
+            exercise_id,
+            item.get("expected_points", []),
+            student_answer,
+            result["covered_points"],
+            result["missing_points"]
+        )
+
+    return {
+        "score_5": result["score_5"],
+        "is_correct": result["is_correct"],
+        "covered_points": result["covered_points"],
+        "missing_points": result["missing_points"],
+        "feedback": feedback
+    }
 
 # ===================== QUIZ =====================
 
 def generate_quiz_item(
     topic: str,
     level: Optional[str] = None,
-    use_ai: bool = False
+    use_ai: bool = False,
+    student_id: Optional[str] = None
 ) -> Dict:
     level = level or "Beginner"
 
     # ======= QUESTION BANK =======
     if not use_ai:
-        items = QUIZZES.get(topic, {}).get(level, [])
-        if items:
-            q = random.choice(items)
-            return {
-                "id": q["id"],
-                "question": q["question"],
-                "options": q["options"],
-                # ✅ التعديل هنا
-                "correct_index": q["correct_index"],
-                "correct_answer": q["options"][q["correct_index"]],
-                "source": "question_bank"
-            }
-
-        return {
-            "id": None,
-            "question": "لا توجد أسئلة كويز حالياً.",
-            "options": [],
-            "source": "empty_bank"
-        }
+        picked = _pick_quiz(topic, level, student_id)
+        if picked:
+            return _quiz_payload(BANK.item_at("quiz", topic, *picked))
+        return dict(EMPTY_QUIZ)
 
     # ======= AI GENERATED =======
-    quiz = generate_ai_quiz(topic, level)
+    with llm_priority(PRIORITY_BACKGROUND, fallback=True):
+        quiz = generate_ai_quiz(topic, level)
     return {
         "id": None,
         "question": quiz.get("question"),
@@ -172,22 +239,185 @@ def evaluate_quiz_answer(
     quiz_id: int,
     student_choice_index: int
 ) -> Dict:
-    for items in QUIZZES.get(topic, {}).values():
-        for q in items:
-            if q["id"] == quiz_id:
-                return evaluate_quiz(
-                    student_choice_index,
-                    q["correct_index"],
-                    q["options"],
-                    q.get(
-                        "explanation",
-                        "هذه هي الإجابة الصحيحة وفق المفهوم الأساسي في هذا الدرس."
-                    )
-                )
-
-    return {"error": "QUIZ_NOT_FOUND"}
+    with span("bank.lookup", kind="quiz", id=quiz_id) as s:
+        q = BANK.find("quiz", topic, quiz_id)
+        s.set(found=q is not None)
+    if not q:
+        return {"error": "QUIZ_NOT_FOUND"}
+
+    return evaluate_quiz(
+        student_choice_index,
+        q["correct_index"],
+        q["options"],
+        q.get(
+            "explanation",
+            "هذه هي الإجابة الصحيحة وفق المفهوم الأساسي في هذا الدرس."
+        )
+    )
+
+# ===================== PRE-SERIALIZED RESPONSES =====================
+
+# Bank-mode bodies never change for a given item, so they are encoded once
+# and served as bytes. Bounded so a huge SQLite bank cannot fill memory.
+BODY_CACHE_LIMIT = int(os.getenv("ASKORA_BODY_CACHE_LIMIT", "100000"))
+# bodies per kind encoded at warmup for the compiled / SQLite banks; the
+# rest stays in the shared mmap / page cache until first requested
+WARMUP_BODIES = int(os.getenv("ASKORA_WARMUP_BODIES", "256"))
+
+_BODIES: Dict[tuple, bytes] = {}
+
+EMPTY_EXERCISE_BODY = dumps(EMPTY_EXERCISE)
+EMPTY_QUIZ_BODY = dumps(EMPTY_QUIZ)
+
+
+def _store_body(key: tuple, body: bytes) -> bytes:
+    if len(_BODIES) < BODY_CACHE_LIMIT:
+        _BODIES[key] = body
+    return body
+
+
+def _item_body(kind: str, topic: str, level: str, index: int) -> bytes:
+    key = (kind, topic, level, index)
+    body = _BODIES.get(key)
+    event("bank.body", kind=kind, level=level, index=index, cached=body is not None)
+    if body is None:
+        item = BANK.item_at(kind, topic, level, index)
+        payload = _exercise_payload(item) if kind == "exercise" else _quiz_payload(item)
+        body = _store_body(key, dumps(payload))
+    return body
+
+
+def exercise_item_body(
+    topic: str,
+    level: Optional[str] = None,
+    student_id: Optional[str] = None
+) -> bytes:
+    """
+    Bank-mode /exercise response as JSON bytes.
+    """
+    picked = _pick_exercise(topic, level or "Beginner", student_id)
+    if not picked:
+        return EMPTY_EXERCISE_BODY
+    return _item_body("exercise", topic, *picked)
+
+
+def quiz_item_body(
+    topic: str,
+    level: Optional[str] = None,
+    student_id: Optional[str] = None
+) -> bytes:
+    """
+    Bank-mode /quiz response as JSON bytes.
+    """
+    picked = _pick_quiz(topic, level or "Beginner", student_id)
+    if not picked:
+        return EMPTY_QUIZ_BODY
+    return _item_body("quiz", topic, *picked)
+
+
+def quiz_evaluation_body(topic: str, quiz_id: int, student_choice_index: int) -> bytes:
+    """
+    /quiz/evaluate response as JSON bytes. Only valid (quiz, choice)
+    pairs are cached, so arbitrary ids cannot grow the cache.
+    """
+    key = ("quiz_eval", topic, quiz_id, student_choice_index)
+    body = _BODIES.get(key)
+    if body is not None:
+        return body
+
+    result = evaluate_quiz_answer(topic, quiz_id, student_choice_index)
+    body = dumps(result)
+    if result.get("student_choice", {}).get("text") is not None:
+        _store_body(key, body)
+    return body
+
+
+def prebuild_bodies(per_kind: Optional[int] = None) -> int:
+    """
+    Encodes bank items up front: all of them for in-memory banks, at most
+    per_kind of each kind otherwise. Never grows past BODY_CACHE_LIMIT.
+    """
+    for kind in ("exercise", "quiz"):
+        payload = _exercise_payload if kind == "exercise" else _quiz_payload
+        positions: Dict[Tuple[str, str], int] = {}
+        built = 0
+        for topic, level, item in BANK.iter_items(kind):
+            if len(_BODIES) >= BODY_CACHE_LIMIT or (per_kind is not None and built >= per_kind):
+                break
+            index = positions.get((topic, level), 0)
+            positions[(topic, level)] = index + 1
+            key = (kind, topic, level, index)
+            if key not in _BODIES:
+                _store_body(key, dumps(payload(item)))
+            built += 1
+    return len(_BODIES)
+
+
+if BANK.backend == "json":
+    prebuild_bodies()
 
 # ===================== CHAT =====================
 
 def chat(topic: str, question: str) -> str:
-    return chat_with_topic_guard(topic, question)
+    # No deterministic answer for free-form chat: overload -> 503
+    with llm_priority(PRIORITY_INTERACTIVE):
+        return chat_with_topic_guard(topic, question)
+
+# ===================== HTTP CACHE KEYS =====================
+# A key means the response is stable until the next content release,
+# so the HTTP layer can derive an ETag from it without generating anything.
+# None means the response may change between calls.
+
+def explanation_cache_key(topic: str, level: Optional[str] = None) -> Optional[Tuple]:
+    level = level or "Beginner"
+    if level not in ALLOWED_LEVELS:
+        level = "Beginner"
+
+    prompt = build_explanation_prompt(topic, level)
+    # only pre-rendered explanations are stable; live ones vary per call
+    text = prerendered.lookup(prompt)
+    if text is None:
+        return None
+    # the text hash changes the ETag when an entry is regenerated in place
+    return ("explain", prerendered.prompt_hash(prompt), prerendered.prompt_hash(text))
+
+
+def chat_cache_key(topic: str, question: str) -> Optional[Tuple]:
+    return criteria_cache_key(topic, question)
+
+
+def quiz_evaluation_cache_key(
+    topic: str,
+    quiz_id: int,
+    student_choice_index: int
+) -> Tuple:
+    return ("quiz_eval", BANK.content_version, topic, quiz_id, student_choice_index)
+
+# ===================== WARMUP =====================
+
+def _warm_bank() -> Dict:
+    # json banks were encoded at import; the others only get a small warm set
+    bodies = len(_BODIES) if BANK.backend == "json" else prebuild_bodies(WARMUP_BODIES)
+    return {"backend": BANK.backend, "bodies": bodies}
+
+
+def _warm_explanations() -> Dict:
+    # builds every explanation prompt once and checks it against the artifact
+    hits = sum(
+        explanation_cache_key(topic, level) is not None
+        for topic in TOPIC_MAP
+        for level in ALLOWED_LEVELS
+    )
+    return {"prerendered": hits, "version": prerendered.content_version()}
+
+
+def warmup_steps():
+    """
+    Steps run by the app lifespan before the worker reports ready.
+    """
+    return [
+        ("rag", lambda: {"chars": preload_rag(TOPIC_MAP.values())}),
+        ("bank", _warm_bank),
+        ("criteria", criteria_version),
+        ("explanations", _warm_explanations),
+    ]
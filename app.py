@@ -1,4 +1,7 @@
-from fastapi import FastAPI
+from anyio import to_thread
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Header, Request
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from typing import List
 
@@ -10,21 +13,96 @@ from ai_service import (
     evaluate_exercise_answer,
     generate_quiz_item,
     evaluate_quiz_answer,
-    chat
+    chat,
+    exercise_item_body,
+    quiz_item_body,
+    quiz_evaluation_body,
+    explanation_cache_key,
+    chat_cache_key,
+    quiz_evaluation_cache_key,
+    warmup_steps,
 )
 
 # ===================== LEVEL CALCULATION =====================
 
 from model_layer.evaluation.level_calculator import calculate_level
 
+# ===================== ADMISSION CONTROL =====================
+
+from model_layer.ai.admission import THREADPOOL_HEADROOM, AdmissionRejected, controller
+from model_layer.ai.gemini_client import probe_models
+from model_layer.ai.prompt_cache import context_cache
+from model_layer.ai.shared_cache import shared_cache
+
+# ===================== QUESTION BANK SAMPLING =====================
+
+from model_layer.bank.sampler import sampler
+
+# ===================== RESPONSES =====================
+
+from model_layer.serving.responses import (
+    FAST_RESPONSES,
+    FastJSONResponse,
+    RawJSONResponse,
+)
+
+from model_layer.serving.http_cache import cached_response
+from model_layer.serving.tracing import TracingMiddleware
+from model_layer.serving import profiling
+from model_layer.serving.capture import CaptureMiddleware
+from model_layer.serving import warmup
+
 # ===================== APP INIT =====================
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Sync routes run on anyio's thread pool (40 threads by default), and
+    # admission only sees a request once it has a thread. Size the pool past
+    # every thread the LLM layer can park (running, queued, waiting on the
+    # shared cache) so overflow is rejected on arrival, not after a pool wait.
+    waiters = shared_cache.max_waiters if shared_cache else 0
+    to_thread.current_default_thread_limiter().total_tokens = (
+        controller.max_concurrent + controller.max_queue + waiters + THREADPOOL_HEADROOM
+    )
+
+    steps = warmup_steps()
+    if warmup.WARMUP_PROBE:
+        steps.append(("models", probe_models))
+    warmup.start(steps)
+    yield
+
+
 app = FastAPI(
+    lifespan=lifespan,
     title="Askora AI Service",
     version="2.4.0",
-    description="Adaptive learning backend for BTEC IT"
+    description="Adaptive learning backend for BTEC IT",
+    default_response_class=FastJSONResponse if FAST_RESPONSES else JSONResponse,
 )
 
+# must be set before any route is declared
+app.router.route_class = profiling.ProfilingRoute
+
+# ===================== TRACING & PROFILING =====================
+
+app.add_middleware(profiling.ProfilingMiddleware)
+app.add_middleware(TracingMiddleware)
+
+# ===================== TRAFFIC CAPTURE =====================
+
+# outermost, so captured latency matches what the client saw
+app.add_middleware(CaptureMiddleware)
+
+# ===================== OVERLOAD =====================
+
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected(request: Request, exc: AdmissionRejected):
+    return JSONResponse(
+        status_code=503,
+        content={"error": "SERVICE_OVERLOADED", "reason": exc.reason},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
 # ===================== REQUEST MODELS =====================
 
 class ExplainRequest(BaseModel):
@@ -36,6 +114,8 @@ class TopicRequest(BaseModel):
     topic: str
     level: str | None = None
     use_ai: bool | None = False
+    # when set, bank items do not repeat until the student has seen them all
+    student_id: str | None = None
 
 
 class ExerciseEvalRequest(BaseModel):
@@ -70,20 +150,72 @@ class LevelResponse(BaseModel):
 def root():
     return {"status": "Askora AI Service is running"}
 
+# ===================== HEALTH =====================
+
+# async: probes must not queue behind LLM callers in the thread pool
+@app.get("/health/live")
+async def health_live():
+    return {"status": "alive"}
+
+
+@app.get("/health/ready")
+async def health_ready():
+    # load balancers should only route to workers that finished warmup
+    status = warmup.state.status()
+    if not status["ready"]:
+        return JSONResponse(status_code=503, content={"status": "warming", **status})
+    return {"status": "ready", **status}
+
+# ===================== METRICS =====================
+
+@app.get("/metrics/admission")
+def admission_metrics():
+    return controller.stats()
+
+
+@app.get("/metrics/prompt-cache")
+def prompt_cache_metrics():
+    return context_cache.stats()
+
+
+@app.get("/metrics/shared-cache")
+def shared_cache_metrics():
+    return shared_cache.stats() if shared_cache else {"backend": "off"}
+
+
+@app.get("/metrics/sampler")
+def sampler_metrics():
+    return sampler.stats()
+
 # ===================== EXPLANATION =====================
 
 @app.post("/explain")
 def explain(data: ExplainRequest):
     return {"answer": explain_topic(data.topic, data.level)}
 
+
+@app.get("/explain")
+def explain_get(request: Request, topic: str, level: str | None = None):
+    return cached_response(
+        request,
+        explanation_cache_key(topic, level),
+        lambda: {"answer": explain_topic(topic, level)},
+    )
+
 # ===================== EXERCISES =====================
 
 @app.post("/exercise")
 def exercise(data: TopicRequest):
+    if FAST_RESPONSES and not data.use_ai:
+        return RawJSONResponse(
+            exercise_item_body(data.topic, data.level, data.student_id)
+        )
+
     return generate_exercise_item(
         data.topic,
         data.level,
-        bool(data.use_ai)
+        bool(data.use_ai),
+        data.student_id
     )
 
 
@@ -99,27 +231,66 @@ def exercise_evaluate(data: ExerciseEvalRequest):
 
 @app.post("/quiz")
 def quiz(data: TopicRequest):
+    if FAST_RESPONSES and not data.use_ai:
+        return RawJSONResponse(
+            quiz_item_body(data.topic, data.level, data.student_id)
+        )
+
     return generate_quiz_item(
         data.topic,
         data.level,
-        bool(data.use_ai)
+        bool(data.use_ai),
+        data.student_id
     )
 
 
 @app.post("/quiz/evaluate")
 def quiz_evaluate(data: QuizEvalRequest):
+    if FAST_RESPONSES:
+        return RawJSONResponse(quiz_evaluation_body(
+            data.topic,
+            data.quiz_id,
+            data.student_choice_index
+        ))
+
     return evaluate_quiz_answer(
         data.topic,
         data.quiz_id,
         data.student_choice_index
     )
 
+
+@app.get("/quiz/evaluate")
+def quiz_evaluate_get(
+    request: Request,
+    topic: str,
+    quiz_id: int,
+    student_choice_index: int
+):
+    return cached_response(
+        request,
+        quiz_evaluation_cache_key(topic, quiz_id, student_choice_index),
+        lambda: RawJSONResponse(
+            quiz_evaluation_body(topic, quiz_id, student_choice_index)
+        ),
+    )
+
 # ===================== CHAT =====================
 
 @app.post("/chat")
 def chat_endpoint(data: ChatRequest):
     return {"answer": chat(data.topic, data.question)}
 
+
+@app.get("/chat")
+def chat_get(request: Request, topic: str, question: str):
+    # criteria answers are cacheable, model answers are not
+    return cached_response(
+        request,
+        chat_cache_key(topic, question),
+        lambda: {"answer": chat(topic, question)},
+    )
+
 # ===================== 🔥 LEVEL API (NEW) =====================
 
 @app.post("/student/level", response_model=LevelResponse)
@@ -138,7 +309,42 @@ def calculate_student_level(data: LevelRequest):
 
     level = calculate_level(avg_score)
 
-    return {
+    payload = {
         "average_score": round(avg_score, 2),
         "level": level
     }
+
+    if FAST_RESPONSES:
+        # skips response_model validation; the payload already matches it
+        return FastJSONResponse(payload)
+    return payload
+
+# ===================== DEBUG: PROFILING =====================
+
+def _forbidden():
+    return JSONResponse(status_code=403, content={"error": "FORBIDDEN"})
+
+
+@app.get("/debug/profile")
+def profile_status(x_askora_profile: str | None = Header(default=None)):
+    if not profiling.is_admin(x_askora_profile):
+        return _forbidden()
+    return profiling.session_status()
+
+
+@app.post("/debug/profile/start")
+def profile_start(
+    seconds: float = 30,
+    interval_ms: float = 5,
+    x_askora_profile: str | None = Header(default=None)
+):
+    if not profiling.is_admin(x_askora_profile):
+        return _forbidden()
+    return profiling.start_session(seconds, interval_ms)
+
+
+@app.post("/debug/profile/stop")
+def profile_stop(x_askora_profile: str | None = Header(default=None)):
+    if not profiling.is_admin(x_askora_profile):
+        return _forbidden()
+    return profiling.stop_session()
@@ -0,0 +1,248 @@
+import heapq
+import itertools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from dotenv import load_dotenv
+from model_layer.serving.tracing import span
+
+# =====================================================
+#                 ENV
+# =====================================================
+
+load_dotenv()
+
+MAX_CONCURRENCY = int(os.getenv("ASKORA_LLM_MAX_CONCURRENCY", "8"))
+MAX_QUEUE = int(os.getenv("ASKORA_LLM_MAX_QUEUE", "32"))
+MAX_WAIT_SECONDS = float(os.getenv("ASKORA_LLM_MAX_WAIT", "10"))
+# worker threads kept for non-LLM routes on top of the LLM callers
+THREADPOOL_HEADROOM = int(os.getenv("ASKORA_THREADPOOL_HEADROOM", "40"))
+
+# =====================================================
+#                 PRIORITIES
+# =====================================================
+
+# Lower value = served first.
+PRIORITY_INTERACTIVE = 0   # /chat, /exercise/evaluate
+PRIORITY_EXPLAIN = 1       # /explain
+PRIORITY_BACKGROUND = 2    # AI tutor / AI quiz generation
+
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_EXPLAIN: "explain",
+    PRIORITY_BACKGROUND: "background",
+}
+
+# =====================================================
+#                 ERRORS
+# =====================================================
+
+class AdmissionRejected(RuntimeError):
+    """
+    Raised when an LLM call cannot be admitted (queue full,
+    evicted by higher priority work, or waited too long).
+    """
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+# =====================================================
+#                 CONTROLLER
+# =====================================================
+
+@dataclass(order=True)
+class _Ticket:
+    priority: int
+    seq: int
+    enqueued_at: float = field(compare=False)
+    rejected: str | None = field(default=None, compare=False)
+
+
+class AdmissionController:
+    """
+    Bounded priority queue in front of the LLM layer.
+
+    At most `max_concurrent` calls run at once. Extra callers wait in a
+    priority queue of at most `max_queue` entries; when it is full a
+    higher priority caller evicts the lowest priority waiter, otherwise
+    the caller is rejected immediately.
+    """
+
+    def __init__(self, max_concurrent: int, max_queue: int, max_wait: float):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+
+        self._cond = threading.Condition()
+        self._queue: list[_Ticket] = []
+        self._seq = itertools.count()
+        self._in_flight = 0
+
+        self._admitted = {p: 0 for p in PRIORITY_NAMES}
+        self._rejected = {p: 0 for p in PRIORITY_NAMES}
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._service_total = 0.0
+        self._service_count = 0
+
+    # ---------- helpers (call with lock held) ----------
+
+    def _retry_after(self) -> int:
+        avg_service = (
+            self._service_total / self._service_count
+            if self._service_count else 1.0
+        )
+        waves = (len(self._queue) + 1) / max(self.max_concurrent, 1)
+        return max(1, round(avg_service * waves))
+
+    def _reject(self, ticket: _Ticket, reason: str):
+        self._rejected[ticket.priority] = self._rejected.get(ticket.priority, 0) + 1
+        raise AdmissionRejected(reason, self._retry_after())
+
+    def _remove(self, ticket: _Ticket):
+        if ticket in self._queue:
+            self._queue.remove(ticket)
+            heapq.heapify(self._queue)
+
+    # ---------- public ----------
+
+    def acquire(self, priority: int) -> float:
+        """
+        Blocks until a slot is free. Returns the time spent waiting.
+        """
+        if self.max_concurrent <= 0:
+            return 0.0
+
+        with self._cond:
+            now = time.monotonic()
+            ticket = _Ticket(priority, next(self._seq), now)
+
+            if self._in_flight < self.max_concurrent and not self._queue:
+                self._in_flight += 1
+                self._admitted[priority] = self._admitted.get(priority, 0) + 1
+                return 0.0
+
+            if len(self._queue) >= self.max_queue:
+                worst = max(self._queue) if self._queue else None
+                if worst is None or worst.priority <= priority:
+                    self._reject(ticket, "QUEUE_FULL")
+                self._remove(worst)
+                worst.rejected = "EVICTED"
+                self._cond.notify_all()
+
+            heapq.heappush(self._queue, ticket)
+            deadline = now + self.max_wait
+
+            while True:
+                if ticket.rejected:
+                    self._reject(ticket, ticket.rejected)
+
+                if self._queue[0] is ticket and self._in_flight < self.max_concurrent:
+                    heapq.heappop(self._queue)
+                    self._in_flight += 1
+                    self._admitted[priority] = self._admitted.get(priority, 0) + 1
+
+                    waited = time.monotonic() - ticket.enqueued_at
+                    self._wait_total += waited
+                    self._wait_max = max(self._wait_max, waited)
+                    # the next waiter may also fit
+                    self._cond.notify_all()
+                    return waited
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._remove(ticket)
+                    self._cond.notify_all()
+                    self._reject(ticket, "WAIT_TIMEOUT")
+
+                self._cond.wait(remaining)
+
+    def release(self, service_time: float):
+        if self.max_concurrent <= 0:
+            return
+
+        with self._cond:
+            self._in_flight -= 1
+            self._service_total += service_time
+            self._service_count += 1
+            self._cond.notify_all()
+
+    def stats(self) -> dict:
+        with self._cond:
+            admitted = sum(self._admitted.values())
+            by_priority = {name: 0 for name in PRIORITY_NAMES.values()}
+            for t in self._queue:
+                by_priority[PRIORITY_NAMES.get(t.priority, str(t.priority))] += 1
+
+            return {
+                "max_concurrent": self.max_concurrent,
+                "max_queue": self.max_queue,
+                "in_flight": self._in_flight,
+                "queue_depth": len(self._queue),
+                "queue_depth_by_priority": by_priority,
+                "admitted": {
+                    PRIORITY_NAMES[p]: n for p, n in self._admitted.items()
+                },
+                "rejected": {
+                    PRIORITY_NAMES[p]: n for p, n in self._rejected.items()
+                },
+                "wait_avg_ms": round(
+                    1000 * self._wait_total / max(admitted, 1), 2
+                ),
+                "wait_max_ms": round(1000 * self._wait_max, 2),
+                "service_avg_ms": round(
+                    1000 * self._service_total / max(self._service_count, 1), 2
+                ),
+            }
+
+
+controller = AdmissionController(MAX_CONCURRENCY, MAX_QUEUE, MAX_WAIT_SECONDS)
+
+# =====================================================
+#                 REQUEST CONTEXT
+# =====================================================
+
+_priority: ContextVar[tuple[int, bool]] = ContextVar(
+    "llm_priority", default=(PRIORITY_INTERACTIVE, False)
+)
+
+
+@contextmanager
+def llm_priority(priority: int, fallback: bool = False):
+    """
+    Sets the priority of LLM calls made inside the block.
+
+    fallback=True means the caller has a deterministic answer, so an
+    overloaded queue makes call_gemini return None instead of raising.
+    """
+    token = _priority.set((priority, fallback))
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> tuple[int, bool]:
+    return _priority.get()
+
+
+@contextmanager
+def admit():
+    """
+    Holds one LLM slot for the duration of the block.
+    Raises AdmissionRejected on overload.
+    """
+    priority, _ = _priority.get()
+    with span("llm.admission", priority=PRIORITY_NAMES.get(priority, priority)) as s:
+        waited = controller.acquire(priority)
+        s.set(wait_ms=round(waited * 1000, 3))
+    started = time.monotonic()
+    try:
+        yield
+    finally:
+        controller.release(time.monotonic() - started)
@@ -1,9 +1,9 @@
-from pathlib import Path
 from typing import List, Optional
 from model_layer.ai.gemini_client import call_gemini
-
-BASE_DIR = Path(__file__).resolve().parents[2]
-RAG_DIR = BASE_DIR / "rag_data"
+from model_layer.serving.tracing import span, event
+from model_layer.ai.rag_store import read_rag
+from model_layer.ai import prerendered
+from model_layer.ai.prompt_cache import CachedPrompt, context_prompt
 
 TOPIC_MAP = {
     "Event-Driven Programming": "event_driven",
@@ -16,19 +16,22 @@ def _load_rag(topic: str) -> str:
     key = TOPIC_MAP.get(topic)
     if not key:
         return ""
-    path = RAG_DIR / f"{key}.txt"
-    return path.read_text(encoding="utf-8") if path.exists() else ""
+    return read_rag(key) or ""
 
-def generate_ai_tutor(
+def _focus_text(focus_points: Optional[List[str]]) -> str:
+    return "، ".join(focus_points) if focus_points else "المفهوم الأساسي في هذا الدرس"
+
+
+def build_tutor_prompt(
     topic: str,
-    level: str = "Beginner",
+    level: str,
     focus_points: Optional[List[str]] = None
-) -> str:
+) -> CachedPrompt:
     rag = _load_rag(topic)
-    focus_text = "، ".join(focus_points) if focus_points else "المفهوم الأساسي في هذا الدرس"
+    focus_text = _focus_text(focus_points)
 
-    prompt = f"""
-أنت مدرس BTEC IT تعمل كمدرّس مساعد.
+    return context_prompt(rag, f"""
+أنت الآن تعمل كمدرّس مساعد.
 
 الموضوع: {topic}
 المستوى: {level}
@@ -45,10 +48,22 @@ def generate_ai_tutor(
 - لا تذكر درجة
 - لا تستخدم Markdown
 - لا تشرح الدرس كاملاً
+""")
+
+
+def generate_ai_tutor(
+    topic: str,
+    level: str = "Beginner",
+    focus_points: Optional[List[str]] = None
+) -> str:
+    with span("prompt.build", kind="tutor") as s:
+        prompt = build_tutor_prompt(topic, level, focus_points)
+        s.set(chars=len(prompt))
+    focus_text = _focus_text(focus_points)
 
-Context:
-{rag}
-"""
+    text = prerendered.lookup(prompt) or call_gemini(prompt)
+    if text:
+        return text.strip()
 
-    text = call_gemini(prompt)
-    return text.strip() if text else f"شرح مبسط حول: {focus_text}."
+    event("fallback", kind="tutor")
+    return f"شرح مبسط حول: {focus_text}."
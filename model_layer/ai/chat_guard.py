@@ -1,10 +1,15 @@
+import hashlib
 import json
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Optional, Dict, Tuple
 from model_layer.ai.gemini_client import call_gemini
+from model_layer.serving.tracing import span, event
+from model_layer.ai.rag_store import read_rag
+from model_layer.ai.prompt_cache import context_prompt
+from model_layer.bank.compiled import get_compiled
 
 BASE_DIR = Path(__file__).resolve().parents[2]
-RAG_DIR = BASE_DIR / "rag_data"
 DATA_DIR = BASE_DIR / "model_layer" / "data"
 
 TOPIC_MAP = {
@@ -30,13 +35,27 @@ def _load_rag(topic: str) -> str:
     key = TOPIC_MAP.get(topic)
     if not key:
         raise ValueError("Unsupported topic")
-    return (RAG_DIR / f"{key}.txt").read_text(encoding="utf-8")
+    rag = read_rag(key)
+    if rag is None:
+        raise FileNotFoundError(f"Missing RAG data for {topic}")
+    return rag
+
+@lru_cache(maxsize=1)
+def _criteria_file() -> Tuple[Dict, str]:
+    raw = (DATA_DIR / "topic_criteria.json").read_bytes()
+    return json.loads(raw), hashlib.sha256(raw).hexdigest()[:16]
 
 def _load_topic_criteria(topic: str) -> Optional[Dict]:
-    file_path = DATA_DIR / "topic_criteria.json"
-    with open(file_path, encoding="utf-8") as f:
-        data = json.load(f)
-    return data.get(topic)
+    compiled = get_compiled()
+    if compiled:
+        return compiled.json_doc(f"criteria/{topic}")
+    return _criteria_file()[0].get(topic)
+
+def criteria_version() -> str:
+    compiled = get_compiled()
+    if compiled:
+        return compiled.content_version
+    return _criteria_file()[1]
 
 def _is_criteria_question(question: str) -> bool:
     q = question.lower()
@@ -62,8 +81,28 @@ def _detect_requested_criteria(question: str) -> str:
         return "D"
     return "ALL"
 
+def criteria_cache_key(topic: str, question: str) -> Optional[Tuple]:
+    """
+    Identifies the deterministic criteria answer for this question, or None
+    when the question goes to the model. Same key -> same answer text.
+    """
+    if not _is_criteria_question(question):
+        return None
+
+    requested_topic = _extract_topic_from_question(question)
+    if requested_topic and requested_topic != topic:
+        outcome = "OUT_OF_SCOPE"
+    else:
+        outcome = _detect_requested_criteria(question)
+
+    return ("criteria", criteria_version(), topic, outcome)
+
 def chat_with_topic_guard(topic: str, question: str) -> str:
-    if _is_criteria_question(question):
+    with span("chat.route") as s:
+        is_criteria = _is_criteria_question(question)
+        s.set(criteria=is_criteria)
+
+    if is_criteria:
         requested_topic = _extract_topic_from_question(question)
         if requested_topic and requested_topic != topic:
             return OUT_OF_SCOPE_MESSAGE
@@ -98,22 +137,22 @@ def chat_with_topic_guard(topic: str, question: str) -> str:
 
     rag = _load_rag(topic)
 
-    prompt = f"""
-أنت مدرس BTEC IT صارم جداً.
+    with span("prompt.build", kind="chat") as s:
+        prompt = context_prompt(rag, f"""
+كن صارماً جداً.
 
 إذا كان السؤال خارج موضوع "{topic}"
 أجب فقط:
 "{OUT_OF_SCOPE_MESSAGE}"
 
-Context:
-{rag}
-
 سؤال الطالب:
 {question}
-"""
+""")
+        s.set(chars=len(prompt))
 
     text = call_gemini(prompt)
     if not text:
+        event("fallback", kind="chat", answer="MODEL_ERROR")
         return "MODEL_ERROR"
 
     if OUT_OF_SCOPE_MESSAGE in text:
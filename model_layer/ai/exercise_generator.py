@@ -1,8 +1,6 @@
-from pathlib import Path
 from model_layer.ai.gemini_client import call_gemini
-
-BASE_DIR = Path(__file__).resolve().parents[2]
-RAG_DIR = BASE_DIR / "rag_data"
+from model_layer.ai.rag_store import read_rag
+from model_layer.ai.prompt_cache import context_prompt
 
 TOPIC_MAP = {
     "Event-Driven Programming": "event_driven",
@@ -15,17 +13,12 @@ def _load_rag(topic: str) -> str:
     key = TOPIC_MAP.get(topic)
     if not key:
         return ""
-    file_path = RAG_DIR / f"{key}.txt"
-    if not file_path.exists():
-        return ""
-    return file_path.read_text(encoding="utf-8")
+    return read_rag(key) or ""
 
 def generate_ai_exercise(topic: str, level: str, focus_point: str) -> str:
     rag = _load_rag(topic)
 
-    prompt = f"""
-أنت مدرس BTEC IT في الأردن.
-
+    prompt = context_prompt(rag, f"""
 أنشئ سؤال تدريب وصفي واحد فقط.
 
 الموضوع: {topic}
@@ -38,9 +31,6 @@ def generate_ai_exercise(topic: str, level: str, focus_point: str) -> str:
 - لا تذكر الحل
 - لا تذكر الدرجة
 - السؤال يجب أن يكون واضحاً ومحدداً
-
-Context:
-{rag}
-"""
+""")
     text = call_gemini(prompt)
     return text.strip() if text else f"اشرح مفهوم {focus_point} مع مثال بسيط."
@@ -1,8 +1,8 @@
-from pathlib import Path
 from model_layer.ai.gemini_client import call_gemini
-
-BASE_DIR = Path(__file__).resolve().parents[2]
-RAG_DIR = BASE_DIR / "rag_data"
+from model_layer.serving.tracing import span, event
+from model_layer.ai.rag_store import read_rag
+from model_layer.ai import prerendered
+from model_layer.ai.prompt_cache import CachedPrompt, context_prompt
 
 TOPIC_MAP = {
     "Event-Driven Programming": "event_driven",
@@ -18,14 +18,10 @@ def _load_rag(topic: str) -> str:
     key = TOPIC_MAP.get(topic)
     if not key:
         return ""
-    path = RAG_DIR / f"{key}.txt"
-    return path.read_text(encoding="utf-8") if path.exists() else ""
-
+    return read_rag(key) or ""
 
-def generate_explanation(topic: str, level: str = "Beginner") -> str:
-    if level not in ALLOWED_LEVELS:
-        level = "Beginner"
 
+def build_explanation_prompt(topic: str, level: str) -> CachedPrompt:
     rag = _load_rag(topic)
 
     if level == "Beginner":
@@ -35,9 +31,7 @@ def generate_explanation(topic: str, level: str = "Beginner") -> str:
     else:
         style = "اشرح بمستوى متقدم مع ربط المفاهيم ببعضها وتوضيح الاستخدام العملي."
 
-    prompt = f"""
-أنت مدرس Pearson BTEC Level 2 IT في الأردن.
-
+    return context_prompt(rag, f"""
 الموضوع: {topic}
 المستوى: {level}
 
@@ -48,15 +42,24 @@ def generate_explanation(topic: str, level: str = "Beginner") -> str:
 - لا تذكر درجات أو تقييم
 - التزم بالمنهاج فقط
 
-Context:
-{rag}
-
 أسلوب الشرح:
 {style}
-"""
+""")
+
 
-    text = call_gemini(prompt)
+def generate_explanation(topic: str, level: str = "Beginner") -> str:
+    if level not in ALLOWED_LEVELS:
+        level = "Beginner"
+
+    with span("prompt.build", kind="explanation") as s:
+        prompt = build_explanation_prompt(topic, level)
+        s.set(chars=len(prompt))
+
+    text = prerendered.lookup(prompt) or call_gemini(prompt)
     if text and text.strip():
         return text.strip()
 
+    event("fallback", kind="explanation")
+
+    rag = _load_rag(topic)
     return rag[:800] if rag else "سيتم شرح هذا المفهوم بشكل مبسط في هذا الدرس."
@@ -0,0 +1,192 @@
+import json
+import os
+import threading
+from itertools import combinations
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterator, List, Tuple
+from dotenv import load_dotenv
+from model_layer.ai.feedback_generator import (
+    fallback_feedback,
+    generate_exercise_feedback,
+    generate_pattern_feedback,
+)
+from model_layer.serving.tracing import span, event
+
+# =====================================================
+#                 ENV & PATHS
+# =====================================================
+
+load_dotenv()
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+DATA_DIR = BASE_DIR / "model_layer" / "data"
+CACHE_PATH = Path(
+    os.getenv("ASKORA_FEEDBACK_CACHE", DATA_DIR / "feedback_cache.json")
+)
+
+# "cached": serve per-pattern feedback, model only on a cache miss
+# "live":   one model call per submission (old behaviour)
+FEEDBACK_MODE = os.getenv("ASKORA_FEEDBACK_MODE", "cached")
+PERSONAL_SUFFIX = os.getenv("ASKORA_FEEDBACK_SUFFIX", "1") == "1"
+
+# 2: entries are keyed by topic and the exercise's expected points
+CACHE_VERSION = 2
+
+# =====================================================
+#                 STATE
+# =====================================================
+
+# (topic, exercise id, expected points, covered points): ids are only
+# unique per topic, and editing expected_points must not reuse old text
+PatternKey = Tuple[str, int, FrozenSet[str], FrozenSet[str]]
+
+_cache: Dict[PatternKey, str] = {}
+_lock = threading.Lock()
+
+
+def pattern_key(
+    topic: str,
+    exercise_id: int,
+    expected_points: List[str],
+    covered_points: List[str],
+) -> PatternKey:
+    return topic, exercise_id, frozenset(expected_points), frozenset(covered_points)
+
+
+def iter_patterns(expected_points: List[str]) -> Iterator[Tuple[List[str], List[str]]]:
+    """
+    Every (covered, missing) split evaluate_exercise can produce,
+    both lists in expected_points order.
+    """
+    for size in range(len(expected_points) + 1):
+        for covered in combinations(expected_points, size):
+            missing = [p for p in expected_points if p not in covered]
+            yield list(covered), missing
+
+# =====================================================
+#                 LOAD / SAVE
+# =====================================================
+
+def load_cache(path: Path = CACHE_PATH) -> int:
+    if not path.exists():
+        return 0
+
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+
+    if data.get("version") != CACHE_VERSION:
+        return 0
+
+    with _lock:
+        for item in data.get("items", []):
+            key = pattern_key(item["topic"], item["exercise_id"], item["expected"], item["covered"])
+            _cache[key] = item["feedback"]
+        return len(_cache)
+
+
+def save_cache(path: Path = CACHE_PATH) -> int:
+    with _lock:
+        items = [
+            {
+                "topic": topic,
+                "exercise_id": exercise_id,
+                "expected": sorted(expected),
+                "covered": sorted(covered),
+                "feedback": text,
+            }
+            for (topic, exercise_id, expected, covered), text in sorted(
+                _cache.items(),
+                key=lambda kv: (kv[0][0], kv[0][1], sorted(kv[0][2]), sorted(kv[0][3])),
+            )
+        ]
+
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"version": CACHE_VERSION, "items": items}, f, ensure_ascii=False, indent=1)
+    tmp.replace(path)
+    return len(items)
+
+# =====================================================
+#                 SERVE
+# =====================================================
+
+def _personal_suffix(student_answer: str, missing_points: List[str]) -> str:
+    words = len(student_answer.split())
+    if not words:
+        return "لم تكتب إجابة، حاول المحاولة مرة أخرى بأسلوبك الخاص."
+    if missing_points and words < 5:
+        return "إجابتك قصيرة جداً، حاول التوسع قليلاً في الشرح."
+    return ""
+
+
+def get_feedback(
+    topic: str,
+    exercise_id: int,
+    expected_points: List[str],
+    student_answer: str,
+    covered_points: List[str],
+    missing_points: List[str],
+) -> str:
+    if FEEDBACK_MODE == "live":
+        return generate_exercise_feedback(student_answer, covered_points, missing_points)
+
+    key = pattern_key(topic, exercise_id, expected_points, covered_points)
+    with span("feedback.cache", exercise_id=exercise_id) as s:
+        text = _cache.get(key)
+        s.set(hit=text is not None)
+
+    if text is None:
+        text = generate_pattern_feedback(covered_points, missing_points)
+        if text is None:
+            # model unavailable: do not cache, retry on a later submission
+            event("fallback", kind="feedback")
+            text = fallback_feedback(covered_points, missing_points)
+        else:
+            with _lock:
+                _cache[key] = text
+
+    if PERSONAL_SUFFIX:
+        suffix = _personal_suffix(student_answer, missing_points)
+        if suffix:
+            text = f"{text}\n{suffix}"
+
+    return text
+
+
+def pregenerate(exercises: Dict, force: bool = False) -> Dict[str, int]:
+    """
+    Fill the cache for every covered-point pattern of every exercise and
+    drop entries of exercises that were removed or had their points edited.
+    """
+    stats = {"generated": 0, "skipped": 0, "failed": 0, "pruned": 0}
+    current = set()
+
+    for topic, levels in exercises.items():
+        for items in levels.values():
+            for item in items:
+                expected = item.get("expected_points", [])
+                for covered, missing in iter_patterns(expected):
+                    key = pattern_key(topic, item["id"], expected, covered)
+                    current.add(key)
+                    if key in _cache and not force:
+                        stats["skipped"] += 1
+                        continue
+
+                    text = generate_pattern_feedback(covered, missing)
+                    if text is None:
+                        stats["failed"] += 1
+                        continue
+
+                    with _lock:
+                        _cache[key] = text
+                    stats["generated"] += 1
+
+    with _lock:
+        for key in [k for k in _cache if k not in current]:
+            del _cache[key]
+            stats["pruned"] += 1
+
+    return stats
+
+
+load_cache()
@@ -44,7 +44,52 @@ def generate_exercise_feedback(
     if text and text.strip():
         return text.strip()
 
-    # Fallback deterministic feedback
+    return fallback_feedback(covered_points, missing_points)
+
+
+def generate_pattern_feedback(
+    covered_points: list[str],
+    missing_points: list[str],
+) -> str | None:
+    """
+    Feedback that depends only on which points were covered, so it can be
+    cached per (exercise_id, covered) and reused for every student with
+    the same outcome. Returns None when the model gives nothing.
+    """
+
+    prompt = f"""
+أنت مدرس BTEC IT.
+
+مهمتك:
+كتابة تعليق قصير ومباشر لطالب أجاب عن سؤال تدريب.
+
+القواعد:
+- لا تشرح الدرس أو التوبك.
+- لا تضف معلومات جديدة.
+- لا تعطي أمثلة.
+- لا تذكر درجات أو تقييم رقمي.
+- لا تقتبس من إجابة الطالب.
+
+نقاط غطاها الطالب بشكل صحيح:
+{covered_points}
+
+نقاط لم يغطها الطالب:
+{missing_points}
+
+اكتب تعليقًا تعليميًا مختصرًا من سطرين إلى ثلاثة أسطر كحد أقصى.
+"""
+
+    text = call_gemini(prompt)
+    if text and text.strip():
+        return text.strip()
+    return None
+
+
+def fallback_feedback(
+    covered_points: list[str],
+    missing_points: list[str],
+) -> str:
+    # Deterministic feedback, no model call
     if not missing_points:
         return "إجابتك جيدة وتغطي جميع النقاط المطلوبة لهذا السؤال."
     if covered_points:
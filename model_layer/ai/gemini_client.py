@@ -1,7 +1,14 @@
 import os
 import time
+from typing import Callable, Dict, Optional
 from dotenv import load_dotenv
 from google import genai
+from model_layer.ai.llm_cassette import Cassette
+from model_layer.ai.local_llm import LocalClient
+from model_layer.ai.prompt_cache import PROMPT_CACHE_ENABLED, context_cache
+from model_layer.ai.shared_cache import shared_cache
+from model_layer.ai.admission import AdmissionRejected, admit, current_priority
+from model_layer.serving.tracing import span
 
 # =====================================================
 #                 ENV
@@ -9,11 +16,21 @@ from google import genai
 
 load_dotenv()
 
+# gemini | record | replay (see llm_cassette) | local (see local_llm)
+LLM_BACKEND = os.getenv("ASKORA_LLM_BACKEND", "gemini")
+
+cassette = Cassette() if LLM_BACKEND in ("record", "replay") else None
+
 API_KEY = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
-if not API_KEY:
-    raise RuntimeError("Missing GEMINI_API_KEY / GOOGLE_API_KEY")
 
-client = genai.Client(api_key=API_KEY)
+if LLM_BACKEND == "replay":
+    client = None
+elif LLM_BACKEND == "local":
+    client = LocalClient()
+else:
+    if not API_KEY:
+        raise RuntimeError("Missing GEMINI_API_KEY / GOOGLE_API_KEY")
+    client = genai.Client(api_key=API_KEY)
 
 # =====================================================
 #                 MODELS
@@ -28,37 +45,147 @@ MODELS = [
 #                 CALL GEMINI (FIXED)
 # =====================================================
 
-def call_gemini(prompt: str):
+def call_gemini(prompt: str, accept: Optional[Callable[[str], bool]] = None):
     """
     Safe Gemini call using google-genai SDK.
     Returns text or None.
+
+    The call goes through the admission queue. When it is overloaded,
+    callers that declared a deterministic fallback get None, the rest
+    get AdmissionRejected.
+
+    Answers are shared between worker processes (see shared_cache):
+    a cached prompt skips admission and the model entirely. Callers that
+    validate the text pass accept, so rejected answers are never shared.
     """
+    # record/replay must see every call: a cache hit would skip the cassette
+    if shared_cache is not None and cassette is None:
+        return shared_cache.get_or_generate(
+            prompt, lambda: _admitted_call(prompt), accept
+        )
+    return _admitted_call(prompt)
 
-    for model in MODELS:
-        try:
-            response = client.models.generate_content(
-                model=model,
-                contents=prompt,
-            )
-
-            # ✅ الطريقة الصحيحة لاستخراج النص
-            if response and hasattr(response, "candidates"):
-                candidates = response.candidates
-                if candidates:
-                    content = candidates[0].content
-                    if content and content.parts:
-                        text = content.parts[0].text
-                        if text:
-                            return text.strip()
-
-        except Exception as e:
-            msg = str(e).lower()
-
-            if "429" in msg or "quota" in msg or "rate" in msg:
-                time.sleep(1)
-                continue
-
-            print("[Gemini Error]:", e)
+
+def _admitted_call(prompt: str):
+    try:
+        with admit():
+            return _call_models(prompt)
+    except AdmissionRejected:
+        _, has_fallback = current_priority()
+        if has_fallback:
             return None
+        raise
+
+
+def probe_models(prompt: str = "ping") -> Dict[str, str]:
+    """
+    Sends a tiny request to every model, bypassing admission, so the
+    client connection and TLS session exist before real traffic.
+    """
+    if client is None:
+        return {}
+
+    results = {}
+    for model in MODELS:
+        with span("llm.probe", model=model) as s:
+            try:
+                client.models.generate_content(model=model, contents=prompt)
+                results[model] = "ok"
+            except Exception as e:
+                results[model] = f"error: {e}"
+            s.set(status=results[model][:5])
+    return results
+
+
+def _create_context_cache(model: str, prefix: str, ttl: int) -> str:
+    cache = client.caches.create(
+        model=model,
+        config={"contents": [prefix], "ttl": f"{ttl}s"},
+    )
+    return cache.name
+
+
+def _generate(model: str, prompt: str, s):
+    """
+    One generate_content call. Prompts with a stable prefix (CachedPrompt)
+    send only their suffix and reference the prefix's context cache.
+    """
+    prefix = getattr(prompt, "prefix", None)
+    if PROMPT_CACHE_ENABLED and prefix:
+        cache_name = context_cache.get(model, prefix, _create_context_cache)
+        if cache_name:
+            try:
+                return client.models.generate_content(
+                    model=model,
+                    contents=prompt.suffix,
+                    config={"cached_content": cache_name},
+                )
+            except Exception as e:
+                if "cache" not in str(e).lower():
+                    raise
+                # expired or deleted on the provider side: next call re-registers
+                context_cache.invalidate(model, prefix)
+                s.set(context_cache="invalidated")
+
+    return client.models.generate_content(
+        model=model,
+        contents=prompt,
+    )
+
+
+def _record_usage(response, s):
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return
+    prompt_tokens = usage.prompt_token_count or 0
+    cached_tokens = usage.cached_content_token_count or 0
+    context_cache.record_usage(prompt_tokens, cached_tokens)
+    s.set(prompt_tokens=prompt_tokens, cached_tokens=cached_tokens)
+
+
+def _call_models(prompt: str):
+    if LLM_BACKEND == "replay":
+        with span("llm.attempt", model="replay", prompt_chars=len(prompt)) as s:
+            text = cassette.replay(prompt)
+            s.set(status="ok" if text else "miss", response_chars=len(text or ""))
+            return text
+
+    for model in MODELS:
+        with span("llm.attempt", model=model, prompt_chars=len(prompt)) as s:
+            try:
+                started = time.perf_counter()
+                response = _generate(model, prompt, s)
+                _record_usage(response, s)
+
+                # ✅ الطريقة الصحيحة لاستخراج النص
+                if response and hasattr(response, "candidates"):
+                    candidates = response.candidates
+                    if candidates:
+                        content = candidates[0].content
+                        if content and content.parts:
+                            text = content.parts[0].text
+                            if text:
+                                s.set(status="ok", response_chars=len(text))
+                                if cassette is not None:
+                                    cassette.record(
+                                        prompt, model, text.strip(),
+                                        (time.perf_counter() - started) * 1000,
+                                    )
+                                return text.strip()
+
+                s.set(status="empty")
+
+            except Exception as e:
+                msg = str(e).lower()
+
+                if "429" in msg or "quota" in msg or "rate" in msg:
+                    s.set(status="rate_limited")
+                    with span("llm.backoff", seconds=1):
+                        time.sleep(1)
+                    continue
+
+                s.set(status="error")
+                print("[Gemini Error]:", e)
+                return None
 
     return None
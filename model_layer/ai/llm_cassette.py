@@ -0,0 +1,72 @@
+"""
+Record / replay stand-in for the LLM.
+
+ASKORA_LLM_BACKEND=record  real Gemini calls, every answer is appended
+                           to the cassette (keyed by prompt hash)
+ASKORA_LLM_BACKEND=replay  no network: answers come from the cassette,
+                           unknown prompts return None (generator fallback)
+
+Only prompt hashes are stored, never prompts (they contain student text).
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+
+CASSETTE_PATH = Path(
+    os.getenv("ASKORA_LLM_CASSETTE", BASE_DIR / "logs" / "llm_cassette.jsonl")
+)
+
+# replay: sleep for the recorded model latency, times this factor (0 = no sleep)
+REPLAY_LATENCY = float(os.getenv("ASKORA_LLM_REPLAY_LATENCY", "0"))
+
+
+def _hash(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+class Cassette:
+    def __init__(self, path: Path = CASSETTE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = {}
+
+        if path.exists():
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries[entry["prompt_hash"]] = entry
+
+    def __len__(self):
+        return len(self._entries)
+
+    def replay(self, prompt: str) -> Optional[str]:
+        entry = self._entries.get(_hash(prompt))
+        if entry is None:
+            return None
+        if REPLAY_LATENCY > 0:
+            time.sleep(entry.get("latency_ms", 0) / 1000 * REPLAY_LATENCY)
+        return entry["text"]
+
+    def record(self, prompt: str, model: str, text: str, latency_ms: float):
+        entry = {
+            "prompt_hash": _hash(prompt),
+            "model": model,
+            "text": text,
+            "latency_ms": round(latency_ms, 3),
+        }
+        with self._lock:
+            self._entries[entry["prompt_hash"]] = entry
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
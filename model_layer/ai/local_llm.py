@@ -0,0 +1,92 @@
+"""
+Offline stand-in for the Gemini client (ASKORA_LLM_BACKEND=local).
+
+Implements the slice of the google-genai surface gemini_client uses:
+models.generate_content (optionally with a cached_content reference)
+and caches.create. Prefill time is simulated per prompt token, with
+cached tokens charged at a fraction of the cost, so prompt caching can
+be measured without network access or an API key.
+"""
+
+import itertools
+import os
+import threading
+import time
+from types import SimpleNamespace
+from typing import Dict, Tuple
+from dotenv import load_dotenv
+from model_layer.ai.prompt_cache import estimate_tokens
+
+load_dotenv()
+
+PREFILL_MS_PER_1K = float(os.getenv("ASKORA_LOCAL_LLM_PREFILL_MS", "40"))
+CACHED_TOKEN_COST = float(os.getenv("ASKORA_LOCAL_LLM_CACHED_COST", "0.1"))
+DECODE_MS = float(os.getenv("ASKORA_LOCAL_LLM_DECODE_MS", "20"))
+# Gemini rejects context caches below a model-specific size
+MIN_CACHE_TOKENS = int(os.getenv("ASKORA_LOCAL_LLM_MIN_CACHE_TOKENS", "0"))
+
+
+def _response(text: str, prompt_tokens: int, cached_tokens: int):
+    part = SimpleNamespace(text=text)
+    return SimpleNamespace(
+        candidates=[SimpleNamespace(content=SimpleNamespace(parts=[part]))],
+        usage_metadata=SimpleNamespace(
+            prompt_token_count=prompt_tokens,
+            cached_content_token_count=cached_tokens,
+            candidates_token_count=estimate_tokens(text),
+        ),
+    )
+
+
+class _Caches:
+    def __init__(self):
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        # name -> (model, text, expires at)
+        self.entries: Dict[str, Tuple[str, str, float]] = {}
+
+    def create(self, model: str, config):
+        text = "".join(config["contents"])
+        if estimate_tokens(text) < MIN_CACHE_TOKENS:
+            raise ValueError(
+                f"400 cached content too small: {estimate_tokens(text)} < {MIN_CACHE_TOKENS} tokens"
+            )
+        ttl = float(str(config["ttl"]).rstrip("s"))
+        with self._lock:
+            name = f"cachedContents/local-{next(self._ids)}"
+            self.entries[name] = (model, text, time.monotonic() + ttl)
+        return SimpleNamespace(name=name, model=model)
+
+    def lookup(self, name: str, model: str) -> str:
+        entry = self.entries.get(name)
+        if entry is None or entry[2] < time.monotonic():
+            raise ValueError(f"404 cached content {name} not found or expired")
+        if entry[0] != model:
+            raise ValueError(f"400 cached content {name} belongs to {entry[0]}")
+        return entry[1]
+
+
+class _Models:
+    def __init__(self, caches: _Caches):
+        self._caches = caches
+
+    def generate_content(self, model: str, contents, config=None):
+        contents = contents if isinstance(contents, str) else "".join(contents)
+        cached = ""
+        name = (config or {}).get("cached_content")
+        if name:
+            cached = self._caches.lookup(name, model)
+
+        cached_tokens = estimate_tokens(cached) if cached else 0
+        fresh_tokens = estimate_tokens(contents)
+        prefill = (fresh_tokens + cached_tokens * CACHED_TOKEN_COST) / 1000 * PREFILL_MS_PER_1K
+        time.sleep((prefill + DECODE_MS) / 1000)
+
+        text = f"رد تجريبي من {model} على طلب من {fresh_tokens + cached_tokens} رمزاً."
+        return _response(text, fresh_tokens + cached_tokens, cached_tokens)
+
+
+class LocalClient:
+    def __init__(self):
+        self.caches = _Caches()
+        self.models = _Models(self.caches)
@@ -0,0 +1,73 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional
+from dotenv import load_dotenv
+from model_layer.serving.tracing import span
+
+# =====================================================
+#                 ENV & PATHS
+# =====================================================
+
+load_dotenv()
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+DATA_DIR = BASE_DIR / "model_layer" / "data"
+ARTIFACT_PATH = Path(
+    os.getenv("ASKORA_PRERENDERED", DATA_DIR / "prerendered.json")
+)
+
+ARTIFACT_VERSION = 1
+
+# =====================================================
+#                 STATE
+# =====================================================
+
+# prompt hash -> generated text
+_content: Dict[str, str] = {}
+_meta: Dict = {}
+
+
+def prompt_hash(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+def load_artifact(path: Path = ARTIFACT_PATH) -> int:
+    """
+    Loads pre-rendered content produced by
+    model_layer.tools.precompute_content. Returns the number of entries.
+    """
+    if not path.exists():
+        return 0
+
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+
+    if data.get("version") != ARTIFACT_VERSION:
+        return 0
+
+    _content.clear()
+    _content.update({h: item["text"] for h, item in data.get("items", {}).items()})
+    _meta.clear()
+    _meta.update({k: v for k, v in data.items() if k != "items"})
+    return len(_content)
+
+
+def lookup(prompt: str) -> Optional[str]:
+    if not _content:
+        return None
+    with span("prerendered.lookup") as s:
+        text = _content.get(prompt_hash(prompt))
+        s.set(hit=text is not None)
+        return text
+
+
+def content_version() -> str:
+    """
+    Identifies the loaded artifact ("" when nothing is loaded).
+    """
+    return _meta.get("content_version", "")
+
+
+load_artifact()
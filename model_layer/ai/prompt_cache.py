@@ -0,0 +1,192 @@
+"""
+Prompt prefix caching.
+
+RAG prompts are built as a stable prefix (teacher role + topic context,
+identical for every call on a corpus) followed by a small variable
+suffix (task rules, level, focus points, question). The LLM layer
+registers each prefix once per model with the provider's context cache
+and sends only the suffix plus a reference to it.
+
+CachedPrompt is still a plain str holding the full prompt, so
+prerendered lookups, the cassette and every other caller keep working
+on the full text.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+from dotenv import load_dotenv
+
+# =====================================================
+#                 ENV
+# =====================================================
+
+load_dotenv()
+
+PROMPT_CACHE_ENABLED = os.getenv("ASKORA_PROMPT_CACHE", "1") == "1"
+PROMPT_CACHE_TTL = int(os.getenv("ASKORA_PROMPT_CACHE_TTL", "3600"))
+# re-register this long before the provider would expire the entry
+PROMPT_CACHE_REFRESH = int(os.getenv("ASKORA_PROMPT_CACHE_REFRESH", "120"))
+# after a failed registration (e.g. the provider is unavailable)
+PROMPT_CACHE_RETRY = int(os.getenv("ASKORA_PROMPT_CACHE_RETRY", "600"))
+# Gemini refuses explicit caches below a model-specific size (1024 tokens
+# for the 2.5 Flash models); smaller prefixes are never registered
+PROMPT_CACHE_MIN_TOKENS = int(os.getenv("ASKORA_PROMPT_CACHE_MIN_TOKENS", "1024"))
+
+# =====================================================
+#                 PROMPTS
+# =====================================================
+
+CONTEXT_PREFIX = """
+أنت مدرس Pearson BTEC Level 2 IT في الأردن.
+التزم بمنهاج Pearson BTEC Level 2 Unit 5 وبالسياق التالي فقط.
+
+Context:
+{rag}
+"""
+
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token; close enough to compare with a minimum
+    return max(1, len(text) // 4)
+
+
+class CachedPrompt(str):
+    """
+    Full prompt text (prefix + suffix) that remembers its split.
+    """
+
+    def __new__(cls, prefix: str, suffix: str):
+        prompt = super().__new__(cls, prefix + suffix)
+        prompt.prefix = prefix
+        prompt.suffix = suffix
+        return prompt
+
+
+def context_prompt(rag: str, suffix: str) -> CachedPrompt:
+    return CachedPrompt(CONTEXT_PREFIX.format(rag=rag), suffix)
+
+# =====================================================
+#                 REGISTRY
+# =====================================================
+
+# (model, prefix, ttl seconds) -> provider cache name
+CreateFn = Callable[[str, str, int], str]
+
+
+class ContextCache:
+    """
+    Provider cache names per (model, prefix hash), refreshed before expiry.
+    One registration per key at a time; other callers wait for it.
+    """
+
+    def __init__(
+        self,
+        ttl: int = PROMPT_CACHE_TTL,
+        refresh: int = PROMPT_CACHE_REFRESH,
+        retry: int = PROMPT_CACHE_RETRY,
+        min_tokens: int = PROMPT_CACHE_MIN_TOKENS,
+    ):
+        self.ttl = ttl
+        self.refresh = min(refresh, ttl // 2)
+        self.retry = retry
+        self.min_tokens = min_tokens
+        self._lock = threading.Lock()
+        self._key_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        # key -> (cache name or None on failure, valid until)
+        self._entries: Dict[Tuple[str, str], Tuple[Optional[str], float]] = {}
+        self._stats = {
+            "registered": 0,
+            "register_failed": 0,
+            "below_minimum": 0,
+            "invalidated": 0,
+            "calls": 0,
+            "cached_calls": 0,
+            "prompt_tokens": 0,
+            "cached_tokens": 0,
+        }
+
+    @staticmethod
+    def _key(model: str, prefix: str) -> Tuple[str, str]:
+        return model, hashlib.sha256(prefix.encode("utf-8")).hexdigest()
+
+    def _fresh(self, key) -> Tuple[bool, Optional[str]]:
+        entry = self._entries.get(key)
+        if entry and time.monotonic() < entry[1]:
+            return True, entry[0]
+        return False, None
+
+    def get(self, model: str, prefix: str, create: CreateFn) -> Optional[str]:
+        """
+        Cache name for this prefix, registering it when missing or about
+        to expire. None when the prefix is below the provider minimum or
+        the provider refused it recently.
+        """
+        if estimate_tokens(prefix) < self.min_tokens:
+            # the provider would refuse it; send the full prompt instead
+            with self._lock:
+                self._stats["below_minimum"] += 1
+            return None
+
+        key = self._key(model, prefix)
+        fresh, name = self._fresh(key)
+        if fresh:
+            return name
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            fresh, name = self._fresh(key)
+            if fresh:
+                return name
+
+            try:
+                name = create(model, prefix, self.ttl)
+                valid_for = self.ttl - self.refresh
+                stat = "registered"
+            except Exception as e:
+                print("[Prompt Cache Error]:", e)
+                name = None
+                valid_for = self.retry
+                stat = "register_failed"
+
+            with self._lock:
+                self._entries[key] = (name, time.monotonic() + valid_for)
+                self._stats[stat] += 1
+            return name
+
+    def invalidate(self, model: str, prefix: str):
+        """
+        Drops an entry the provider no longer knows (expired or deleted).
+        """
+        with self._lock:
+            if self._entries.pop(self._key(model, prefix), None):
+                self._stats["invalidated"] += 1
+
+    def record_usage(self, prompt_tokens: int, cached_tokens: int):
+        with self._lock:
+            self._stats["calls"] += 1
+            self._stats["cached_calls"] += 1 if cached_tokens else 0
+            self._stats["prompt_tokens"] += prompt_tokens
+            self._stats["cached_tokens"] += cached_tokens
+
+    def stats(self) -> dict:
+        with self._lock:
+            now = time.monotonic()
+            stats = dict(self._stats)
+            stats["entries"] = sum(
+                1 for name, until in self._entries.values() if name and until > now
+            )
+            stats["cached_token_ratio"] = round(
+                stats["cached_tokens"] / max(stats["prompt_tokens"], 1), 3
+            )
+            stats["enabled"] = PROMPT_CACHE_ENABLED
+            stats["ttl"] = self.ttl
+            stats["min_tokens"] = self.min_tokens
+            return stats
+
+
+context_cache = ContextCache()
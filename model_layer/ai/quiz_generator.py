@@ -1,13 +1,8 @@
-from pathlib import Path
 import json
 from model_layer.ai.gemini_client import call_gemini
-
-# =====================================================
-#                     PATHS
-# =====================================================
-
-BASE_DIR = Path(__file__).resolve().parents[2]
-RAG_DIR = BASE_DIR / "rag_data"
+from model_layer.serving.tracing import span, event
+from model_layer.ai.rag_store import read_rag
+from model_layer.ai.prompt_cache import context_prompt
 
 # =====================================================
 #                     CONSTANTS
@@ -28,8 +23,7 @@ def _load_rag(topic: str) -> str:
     key = TOPIC_MAP.get(topic)
     if not key:
         return ""
-    path = RAG_DIR / f"{key}.txt"
-    return path.read_text(encoding="utf-8") if path.exists() else ""
+    return read_rag(key) or ""
 
 # =====================================================
 #                     HELPERS
@@ -76,9 +70,8 @@ def generate_ai_quiz(topic: str, level: str) -> dict:
 
     rag = _load_rag(topic)
 
-    prompt = f"""
-أنت مدرس BTEC IT.
-
+    with span("prompt.build", kind="quiz") as s:
+        prompt = context_prompt(rag, f"""
 أنشئ سؤال اختيار من متعدد (MCQ) للتدريب فقط.
 
 الموضوع: {topic}
@@ -91,19 +84,20 @@ def generate_ai_quiz(topic: str, level: str) -> dict:
 - لا تضف شرح
 - لا نص إضافي خارج JSON
 
-Context:
-{rag}
-
 أعد النتيجة بصيغة JSON فقط:
 {{
   "question": "",
   "options": ["", "", "", ""],
   "correct_index": 0
 }}
-"""
+""")
+        s.set(chars=len(prompt))
+
+    text = call_gemini(prompt, accept=lambda t: _safe_json_parse(t) is not None)
 
-    text = call_gemini(prompt)
-    quiz = _safe_json_parse(text)
+    with span("llm.parse", kind="quiz") as s:
+        quiz = _safe_json_parse(text)
+        s.set(valid=quiz is not None)
 
     if quiz:
         idx = quiz["correct_index"]
@@ -116,6 +110,7 @@ Context:
         }
 
     # ---------- Fallback ----------
+    event("fallback", kind="quiz")
     fallback_options = [
         "مفهوم غير متعلق",
         "مفهوم أساسي في الموضوع",
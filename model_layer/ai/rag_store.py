@@ -0,0 +1,49 @@
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+from model_layer.bank.compiled import get_compiled
+from model_layer.serving.tracing import span
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+RAG_DIR = BASE_DIR / "rag_data"
+
+# filled by preload() during warmup; read_rag() falls back to disk
+_preloaded: Dict[str, str] = {}
+
+
+def _read(key: str) -> Optional[str]:
+    compiled = get_compiled()
+    if compiled:
+        return compiled.doc(f"rag/{key}")
+    path = RAG_DIR / f"{key}.txt"
+    return path.read_text(encoding="utf-8") if path.exists() else None
+
+
+def read_rag(key: str) -> Optional[str]:
+    """
+    RAG text for a TOPIC_MAP key ("oop", "procedural", ...).
+    Served from the compiled data artifact when enabled, else from
+    rag_data/<key>.txt. Returns None when there is no such corpus.
+    """
+    with span("rag.load", key=key) as s:
+        text = _preloaded.get(key)
+        if text is not None:
+            s.set(source="memory")
+        else:
+            text = _read(key)
+            s.set(source="compiled" if get_compiled() else "file")
+
+        s.set(chars=len(text) if text else 0)
+        return text
+
+
+def preload(keys: Iterable[str]) -> int:
+    """
+    Keeps the given corpora in memory. Returns the number of characters loaded.
+    """
+    total = 0
+    for key in set(keys):
+        text = _read(key)
+        if text is not None:
+            _preloaded[key] = text
+            total += len(text)
+    return total
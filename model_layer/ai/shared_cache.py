@@ -0,0 +1,376 @@
+"""
+Generation cache shared by every worker process on a host.
+
+Successful LLM answers are stored by prompt hash, so a prompt generated
+by one uvicorn worker is served from the cache by all the others. Only
+one process generates a missing prompt at a time: it takes a short lease
+on the key, and the others poll for the result until the lease holder
+publishes it or the lease expires.
+
+Backends (ASKORA_SHARED_CACHE):
+    sqlite  WAL-mode database file, size bounded with LRU eviction (default)
+    redis   any Redis-protocol server; bound its size with
+            maxmemory + allkeys-lru on the server
+    off     no shared cache
+
+A cache failure never fails a request: the call goes to the model.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, Dict, Optional
+from dotenv import load_dotenv
+from model_layer.serving.resp import RespClient
+from model_layer.serving.tracing import span
+
+# =====================================================
+#                 ENV
+# =====================================================
+
+load_dotenv()
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+DATA_DIR = BASE_DIR / "model_layer" / "data"
+
+SHARED_CACHE = os.getenv("ASKORA_SHARED_CACHE", "sqlite")
+SHARED_CACHE_DB = Path(
+    os.getenv("ASKORA_SHARED_CACHE_DB", DATA_DIR / "shared_cache.sqlite3")
+)
+SHARED_CACHE_URL = os.getenv("ASKORA_SHARED_CACHE_URL", "redis://127.0.0.1:6379/0")
+SHARED_CACHE_MAX_BYTES = int(os.getenv("ASKORA_SHARED_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+SHARED_CACHE_TTL = int(os.getenv("ASKORA_SHARED_CACHE_TTL", "86400"))
+# longest a generation may hold the key before others take over
+SHARED_CACHE_LEASE = float(os.getenv("ASKORA_SHARED_CACHE_LEASE", "30"))
+# longest a caller waits for another process before generating itself
+SHARED_CACHE_WAIT = float(os.getenv("ASKORA_SHARED_CACHE_WAIT", "20"))
+# threads that may poll for another process at once; the rest generate
+# through the admission queue, which bounds them
+SHARED_CACHE_MAX_WAITERS = int(os.getenv("ASKORA_SHARED_CACHE_MAX_WAITERS", "16"))
+
+POLL_SECONDS = 0.05
+# LRU order is refreshed at most this often per entry, to keep hits read-only
+ACCESS_RESOLUTION = 60
+
+
+# callers decide which answers are worth sharing (e.g. parseable quiz JSON)
+Accept = Callable[[str], bool]
+
+
+def prompt_hash(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+def _non_blank(text: str) -> bool:
+    return bool(text.strip())
+
+# =====================================================
+#                 SQLITE BACKEND
+# =====================================================
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key      TEXT PRIMARY KEY,
+    value    TEXT NOT NULL,
+    size     INTEGER NOT NULL,
+    accessed REAL NOT NULL,
+    expires  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+CREATE TABLE IF NOT EXISTS leases (
+    key     TEXT PRIMARY KEY,
+    owner   TEXT NOT NULL,
+    expires REAL NOT NULL
+);
+-- running totals kept in the same transaction as the entries they count
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta
+    SELECT 'bytes', COALESCE(SUM(size), 0) FROM entries;
+"""
+
+
+class SqliteCache:
+    name = "sqlite"
+
+    def __init__(
+        self,
+        path: Path = SHARED_CACHE_DB,
+        max_bytes: int = SHARED_CACHE_MAX_BYTES,
+        ttl: int = SHARED_CACHE_TTL,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._local = threading.local()
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # autocommit; writers serialize on the WAL lock
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        row = self._conn().execute(
+            "SELECT value, accessed, expires FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or row[2] < now:
+            return None
+        if now - row[1] > ACCESS_RESOLUTION:
+            self._conn().execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+        return row[0]
+
+    def put(self, key: str, value: str):
+        now = time.time()
+        size = len(value.encode("utf-8"))
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            old = conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now + self.ttl),
+            )
+            total = conn.execute(
+                "UPDATE meta SET value = value + ? WHERE key = 'bytes' RETURNING value",
+                (size - (old[0] if old else 0),),
+            ).fetchone()[0]
+            if total > self.max_bytes:
+                self._evict(conn, now)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        # rare (once per ~10% of max_bytes written), so the full scans here
+        # also re-sync the running total
+        conn.execute("DELETE FROM entries WHERE expires < ?", (now,))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+        # evict down to 90% so the next puts do not evict one by one
+        target = self.max_bytes * 0.9
+        victims = []
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY accessed"):
+            if total <= target:
+                break
+            victims.append((key,))
+            total -= size
+        conn.executemany("DELETE FROM entries WHERE key = ?", victims)
+        conn.execute("UPDATE meta SET value = ? WHERE key = 'bytes'", (total,))
+
+    def acquire(self, key: str, owner: str, lease: float) -> bool:
+        now = time.time()
+        cursor = self._conn().execute(
+            """
+            INSERT INTO leases VALUES (?, ?, ?)
+            ON CONFLICT (key) DO UPDATE
+                SET owner = excluded.owner, expires = excluded.expires
+                WHERE leases.expires < ?
+            """,
+            (key, owner, now + lease, now),
+        )
+        return cursor.rowcount == 1
+
+    def release(self, key: str, owner: str):
+        self._conn().execute("DELETE FROM leases WHERE key = ? AND owner = ?", (key, owner))
+
+    def stats(self) -> Dict:
+        count, size = self._conn().execute(
+            "SELECT (SELECT COUNT(*) FROM entries), value FROM meta WHERE key = 'bytes'"
+        ).fetchone()
+        return {"entries": count, "bytes": size, "max_bytes": self.max_bytes}
+
+# =====================================================
+#                 REDIS BACKEND
+# =====================================================
+
+class RedisCache:
+    name = "redis"
+
+    def __init__(self, url: str = SHARED_CACHE_URL, ttl: int = SHARED_CACHE_TTL):
+        self.client = RespClient(url)
+        self.ttl = ttl
+        self.prefix = "askora:gen:"
+        self.client.execute("PING")
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.client.execute("GET", self.prefix + key)
+        return value.decode("utf-8") if value is not None else None
+
+    def put(self, key: str, value: str):
+        self.client.execute("SET", self.prefix + key, value, "EX", self.ttl)
+
+    def acquire(self, key: str, owner: str, lease: float) -> bool:
+        reply = self.client.execute(
+            "SET", f"{self.prefix}lease:{key}", owner, "NX", "PX", int(lease * 1000)
+        )
+        return reply == "OK"
+
+    def release(self, key: str, owner: str):
+        # check-then-delete is not atomic; the lease TTL bounds the damage
+        lease_key = f"{self.prefix}lease:{key}"
+        if self.client.execute("GET", lease_key) == owner.encode("utf-8"):
+            self.client.execute("DEL", lease_key)
+
+    def stats(self) -> Dict:
+        return {"entries": self.client.execute("DBSIZE")}
+
+# =====================================================
+#                 FRONTEND
+# =====================================================
+
+class SharedCache:
+    def __init__(
+        self,
+        backend,
+        lease: float = SHARED_CACHE_LEASE,
+        wait: float = SHARED_CACHE_WAIT,
+        max_waiters: int = SHARED_CACHE_MAX_WAITERS,
+    ):
+        self.backend = backend
+        self.lease = lease
+        self.wait = wait
+        self.max_waiters = max_waiters
+        self._lock = threading.Lock()
+        self._waiters = 0
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "generated": 0,
+            "waited": 0,
+            "wait_hits": 0,
+            "wait_timeouts": 0,
+            "wait_overflow": 0,
+            "errors": 0,
+        }
+
+    def _count(self, stat: str):
+        with self._lock:
+            self._stats[stat] += 1
+
+    def _enter_wait(self) -> bool:
+        with self._lock:
+            if self._waiters >= self.max_waiters:
+                self._stats["wait_overflow"] += 1
+                return False
+            self._waiters += 1
+            self._stats["waited"] += 1
+            return True
+
+    def _leave_wait(self):
+        with self._lock:
+            self._waiters -= 1
+
+    def _safe(self, op: str, *args, default=None):
+        try:
+            return getattr(self.backend, op)(*args)
+        except Exception as e:
+            print(f"[Shared Cache Error] {op}:", e)
+            self._count("errors")
+            return default
+
+    def _get(self, key: str, accept: Accept) -> Optional[str]:
+        # entries the caller would reject count as misses and get overwritten
+        text = self._safe("get", key)
+        return text if text is not None and accept(text) else None
+
+    def get_or_generate(
+        self,
+        prompt: str,
+        generate: Callable[[], Optional[str]],
+        accept: Optional[Accept] = None,
+    ) -> Optional[str]:
+        """
+        Cached text for the prompt, or generate() run by exactly one
+        process while the others wait for its result. Only results the
+        caller accepts (by default: non-blank) are cached.
+        """
+        accept = accept or _non_blank
+        key = prompt_hash(prompt)
+        with span("shared_cache.get", backend=self.backend.name) as s:
+            text = self._get(key, accept)
+            s.set(hit=text is not None)
+        if text is not None:
+            self._count("hits")
+            return text
+        self._count("misses")
+
+        owner = uuid.uuid4().hex
+        deadline = time.monotonic() + self.wait
+        waiting = False
+
+        try:
+            while True:
+                # an unreachable backend counts as acquired: just generate
+                if self._safe("acquire", key, owner, self.lease, default=True):
+                    try:
+                        # another process may have published between our miss and the lease
+                        text = self._get(key, accept)
+                        if text is None:
+                            text = generate()
+                            self._count("generated")
+                            if text is not None and accept(text):
+                                self._safe("put", key, text)
+                        return text
+                    finally:
+                        self._safe("release", key, owner)
+
+                if not waiting:
+                    waiting = self._enter_wait()
+                    if not waiting:
+                        return generate()
+
+                with span("shared_cache.wait"):
+                    time.sleep(POLL_SECONDS)
+                    text = self._get(key, accept)
+                if text is not None:
+                    self._count("wait_hits")
+                    return text
+
+                if time.monotonic() > deadline:
+                    self._count("wait_timeouts")
+                    break
+        finally:
+            if waiting:
+                self._leave_wait()
+
+        return generate()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["waiters"] = self._waiters
+        stats["max_waiters"] = self.max_waiters
+        stats["backend"] = self.backend.name
+        stats.update(self._safe("stats", default={}))
+        return stats
+
+
+def _load() -> Optional[SharedCache]:
+    try:
+        if SHARED_CACHE == "sqlite":
+            return SharedCache(SqliteCache())
+        if SHARED_CACHE == "redis":
+            return SharedCache(RedisCache())
+    except Exception as e:
+        print(f"[Shared Cache Error] {SHARED_CACHE} unavailable:", e)
+    return None
+
+
+shared_cache = _load()
@@ -0,0 +1,286 @@
+"""
+Compiled, read-only data artifact.
+
+All static data (question banks, id indexes, level rules, topic criteria
+and RAG text) is packed into one binary file that every worker mmaps.
+Pages are shared between processes and items are decoded only when used.
+
+Layout (little endian):
+
+    header   MAGIC, version, content hash, section offsets/counts
+    strings  UTF-8 string table (names, JSON item bodies, documents)
+    groups   (kind, topic, level) -> contiguous slice of items
+    items    (id, group, body)           sorted by group
+    ids      (kind, id, item position)   sorted for binary search
+    docs     (key, body)                 sorted by key
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+from dotenv import load_dotenv
+
+# =====================================================
+#                 ENV & PATHS
+# =====================================================
+
+load_dotenv()
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+DATA_DIR = BASE_DIR / "model_layer" / "data"
+RAG_DIR = BASE_DIR / "rag_data"
+
+COMPILED_PATH = Path(
+    os.getenv("ASKORA_COMPILED_DATA", DATA_DIR / "askora_data.bin")
+)
+
+# =====================================================
+#                 FORMAT
+# =====================================================
+
+MAGIC = b"ASKD"
+FORMAT_VERSION = 1
+
+KIND_EXERCISE = 0
+KIND_QUIZ = 1
+KINDS = {"exercise": KIND_EXERCISE, "quiz": KIND_QUIZ}
+
+# magic, version, content hash, then (offset, count) for
+# strings, groups, items, ids, docs
+_HEADER = struct.Struct("<4sI16s10I")
+_GROUP = struct.Struct("<IIIIIII")       # kind, topic ref, level ref, first, count
+_ITEM = struct.Struct("<iIII")           # id, group, body ref
+_ID = struct.Struct("<IiI")              # kind, id, item position
+_DOC = struct.Struct("<IIII")            # key ref, body ref
+
+# =====================================================
+#                 COMPILER
+# =====================================================
+
+class _StringTable:
+    def __init__(self):
+        self.buf = bytearray()
+        self._seen: Dict[bytes, Tuple[int, int]] = {}
+
+    def add(self, text: str) -> Tuple[int, int]:
+        data = text.encode("utf-8")
+        if data not in self._seen:
+            self._seen[data] = (len(self.buf), len(data))
+            self.buf += data
+        return self._seen[data]
+
+
+def _source_docs() -> Dict[str, str]:
+    docs = {}
+    with open(DATA_DIR / "level_rules.json", encoding="utf-8") as f:
+        docs["level_rules"] = json.dumps(json.load(f), ensure_ascii=False)
+    with open(DATA_DIR / "topic_criteria.json", encoding="utf-8") as f:
+        for topic, criteria in json.load(f).items():
+            docs[f"criteria/{topic}"] = json.dumps(criteria, ensure_ascii=False)
+    for path in sorted(RAG_DIR.glob("*.txt")):
+        docs[f"rag/{path.stem}"] = path.read_text(encoding="utf-8")
+    return docs
+
+
+def compile_data(out_path: Path = COMPILED_PATH) -> Dict:
+    banks = {}
+    for kind, name in (("exercise", "exercises.json"), ("quiz", "quizzes.json")):
+        with open(DATA_DIR / name, encoding="utf-8") as f:
+            banks[kind] = json.load(f)
+    docs = _source_docs()
+
+    strings = _StringTable()
+    groups, items, ids = [], [], []
+
+    for kind, bank in banks.items():
+        for topic, levels in bank.items():
+            for level, level_items in levels.items():
+                group = len(groups)
+                groups.append((
+                    KINDS[kind], *strings.add(topic), *strings.add(level),
+                    len(items), len(level_items),
+                ))
+                for item in level_items:
+                    body = strings.add(json.dumps(item, ensure_ascii=False))
+                    ids.append((KINDS[kind], item["id"], len(items)))
+                    items.append((item["id"], group, *body))
+
+    ids.sort()
+    doc_rows = sorted(
+        (key.encode("utf-8"), strings.add(key), strings.add(text))
+        for key, text in docs.items()
+    )
+
+    sections = [
+        bytes(strings.buf),
+        b"".join(_GROUP.pack(*g) for g in groups),
+        b"".join(_ITEM.pack(*i) for i in items),
+        b"".join(_ID.pack(*i) for i in ids),
+        b"".join(_DOC.pack(*k, *b) for _, k, b in doc_rows),
+    ]
+    counts = [len(strings.buf), len(groups), len(items), len(ids), len(doc_rows)]
+
+    body = bytearray()
+    layout = []
+    for section, count in zip(sections, counts):
+        # keep fixed-size tables 8-byte aligned
+        body += b"\0" * (-(_HEADER.size + len(body)) % 8)
+        layout += [_HEADER.size + len(body), count]
+        body += section
+
+    content_hash = hashlib.sha256(bytes(body)).digest()[:16]
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, content_hash, *layout)
+
+    tmp = out_path.with_suffix(".tmp")
+    with open(tmp, "wb") as f:
+        f.write(header)
+        f.write(body)
+    tmp.replace(out_path)
+
+    return {
+        "path": str(out_path),
+        "bytes": len(header) + len(body),
+        "content_hash": content_hash.hex(),
+        "groups": len(groups),
+        "items": len(items),
+        "docs": len(doc_rows),
+    }
+
+# =====================================================
+#                 READER
+# =====================================================
+
+class CompiledData:
+    backend = "compiled"
+
+    def __init__(self, path: Path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (
+            magic, version, content_hash,
+            self._str_off, _,
+            groups_off, n_groups,
+            self._items_off, self._n_items,
+            self._ids_off, self._n_ids,
+            docs_off, n_docs,
+        ) = _HEADER.unpack_from(self._mm, 0)
+
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported data artifact: {path}")
+
+        self.content_hash = content_hash.hex()
+        self.content_version = self.content_hash
+
+        # the small tables are decoded once; items stay in the mapping
+        self._groups: Dict[Tuple[int, str, str], Tuple[int, int]] = {}
+        self._group_topics: List[str] = []
+        self._levels: Dict[Tuple[int, str], List[str]] = {}
+        for i in range(n_groups):
+            kind, t_off, t_len, l_off, l_len, first, count = _GROUP.unpack_from(
+                self._mm, groups_off + i * _GROUP.size
+            )
+            topic = self._str(t_off, t_len)
+            level = self._str(l_off, l_len)
+            self._groups[(kind, topic, level)] = (first, count)
+            self._group_topics.append(topic)
+            self._levels.setdefault((kind, topic), []).append(level)
+
+        self._docs: Dict[str, Tuple[int, int]] = {}
+        for i in range(n_docs):
+            k_off, k_len, b_off, b_len = _DOC.unpack_from(
+                self._mm, docs_off + i * _DOC.size
+            )
+            self._docs[self._str(k_off, k_len)] = (b_off, b_len)
+
+    def _str(self, offset: int, length: int) -> str:
+        start = self._str_off + offset
+        return self._mm[start:start + length].decode("utf-8")
+
+    def _item(self, position: int) -> Tuple[int, int, Dict]:
+        item_id, group, b_off, b_len = _ITEM.unpack_from(
+            self._mm, self._items_off + position * _ITEM.size
+        )
+        return item_id, group, json.loads(self._str(b_off, b_len))
+
+    # ---------- question banks ----------
+
+    def levels(self, kind: str, topic: str) -> List[str]:
+        return self._levels.get((KINDS[kind], topic), [])
+
+    def count(self, kind: str, topic: str, level: str) -> int:
+        return self._groups.get((KINDS[kind], topic, level), (0, 0))[1]
+
+    def item_at(self, kind: str, topic: str, level: str, index: int) -> Dict:
+        first, count = self._groups[(KINDS[kind], topic, level)]
+        if not 0 <= index < count:
+            raise IndexError(index)
+        return self._item(first + index)[2]
+
+    def find(self, kind: str, topic: str, item_id: int) -> Optional[Dict]:
+        key = (KINDS[kind], item_id)
+        lo, hi = 0, self._n_ids
+        while lo < hi:
+            mid = (lo + hi) // 2
+            k, i, _ = _ID.unpack_from(self._mm, self._ids_off + mid * _ID.size)
+            if (k, i) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        # ids are unique per bank in practice, but scan equal keys anyway
+        while lo < self._n_ids:
+            k, i, position = _ID.unpack_from(self._mm, self._ids_off + lo * _ID.size)
+            if (k, i) != key:
+                break
+            _, group, item = self._item(position)
+            if self._group_topics[group] == topic:
+                return item
+            lo += 1
+        return None
+
+    def iter_items(self, kind: str) -> Iterator[Tuple[str, str, Dict]]:
+        for (k, topic, level), (first, count) in self._groups.items():
+            if k != KINDS[kind]:
+                continue
+            for position in range(first, first + count):
+                yield topic, level, self._item(position)[2]
+
+    # ---------- documents ----------
+
+    def doc(self, key: str) -> Optional[str]:
+        ref = self._docs.get(key)
+        return self._str(*ref) if ref else None
+
+    def json_doc(self, key: str) -> Optional[Dict]:
+        text = self.doc(key)
+        return json.loads(text) if text is not None else None
+
+# =====================================================
+#                 SHARED INSTANCE
+# =====================================================
+
+_compiled: Optional[CompiledData] = None
+_lock = threading.Lock()
+
+
+def get_compiled() -> Optional[CompiledData]:
+    """
+    The mmapped artifact when ASKORA_DATA_BACKEND=compiled, else None.
+    """
+    global _compiled
+
+    if os.getenv("ASKORA_DATA_BACKEND", "json") != "compiled":
+        return None
+
+    if _compiled is None:
+        with _lock:
+            if _compiled is None:
+                _compiled = CompiledData(COMPILED_PATH)
+    return _compiled
@@ -0,0 +1,91 @@
+"""
+Question bank access for ai_service.
+
+Every backend exposes the same small API, with kind = "exercise" | "quiz":
+
+    levels(kind, topic)                 -> level names
+    count(kind, topic, level)           -> number of items
+    item_at(kind, topic, level, index)  -> item dict
+    find(kind, topic, item_id)          -> item dict or None
+    iter_items(kind)                    -> (topic, level, item) tuples
+    content_version                     -> short hash of the bank content
+
+The backend is chosen with ASKORA_DATA_BACKEND (json | compiled | sqlite).
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+from dotenv import load_dotenv
+from model_layer.bank.compiled import get_compiled
+
+load_dotenv()
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+DATA_DIR = BASE_DIR / "model_layer" / "data"
+
+BANK_FILES = {
+    "exercise": "exercises.json",
+    "quiz": "quizzes.json",
+}
+
+
+class JsonBank:
+    """
+    The JSON files held in memory as nested dicts. Fine for small banks.
+    """
+
+    backend = "json"
+
+    def __init__(self, data_dir: Path = DATA_DIR):
+        self._banks: Dict[str, Dict] = {}
+        self._ids: Dict[str, Dict[Tuple[str, int], Dict]] = {}
+
+        digest = hashlib.sha256()
+        for kind, name in BANK_FILES.items():
+            raw = (data_dir / name).read_bytes()
+            digest.update(raw)
+            bank = json.loads(raw)
+            self._banks[kind] = bank
+            self._ids[kind] = {
+                (topic, item["id"]): item
+                for topic, levels in bank.items()
+                for items in levels.values()
+                for item in items
+            }
+
+        # changes whenever the bank files change (HTTP ETags, caches)
+        self.content_version = digest.hexdigest()[:16]
+
+    def levels(self, kind: str, topic: str) -> List[str]:
+        return list(self._banks[kind].get(topic, {}))
+
+    def count(self, kind: str, topic: str, level: str) -> int:
+        return len(self._banks[kind].get(topic, {}).get(level, []))
+
+    def item_at(self, kind: str, topic: str, level: str, index: int) -> Dict:
+        return self._banks[kind][topic][level][index]
+
+    def find(self, kind: str, topic: str, item_id: int) -> Optional[Dict]:
+        return self._ids[kind].get((topic, item_id))
+
+    def iter_items(self, kind: str) -> Iterator[Tuple[str, str, Dict]]:
+        for topic, levels in self._banks[kind].items():
+            for level, items in levels.items():
+                for item in items:
+                    yield topic, level, item
+
+
+def load_bank():
+    backend = os.getenv("ASKORA_DATA_BACKEND", "json")
+
+    if backend == "compiled":
+        return get_compiled()
+    if backend == "sqlite":
+        from model_layer.bank.sqlite_store import SqliteBank
+        return SqliteBank()
+    if backend != "json":
+        raise RuntimeError(f"Unknown ASKORA_DATA_BACKEND: {backend}")
+    return JsonBank()
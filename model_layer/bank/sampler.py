@@ -0,0 +1,93 @@
+"""
+Per-student no-repeat sampling over question bank groups.
+
+Each (student, kind, topic, level) gets a deck: a shuffled permutation
+of the group's item indices stored as a compact array (2 bytes per item
+for groups under 65536 items) plus a cursor. Drawing is O(1); a student
+sees every item of the group before any repeats, and the deck is
+reshuffled when exhausted. Decks of idle students are evicted LRU.
+
+Decks live in worker memory: with several workers, sticky routing per
+student keeps the no-repeat guarantee exact.
+"""
+
+import os
+import random
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Dict, Tuple
+from dotenv import load_dotenv
+
+load_dotenv()
+
+SAMPLER_MAX_DECKS = int(os.getenv("ASKORA_SAMPLER_MAX_DECKS", "100000"))
+
+DeckKey = Tuple[str, str, str, str]
+
+
+class Deck:
+    __slots__ = ("order", "cursor")
+
+    def __init__(self, order: array):
+        self.order = order
+        self.cursor = 0
+
+
+class DeckSampler:
+    def __init__(self, max_decks: int = SAMPLER_MAX_DECKS, rng: random.Random = None):
+        self.max_decks = max_decks
+        self._rng = rng or random.Random()
+        self._decks: "OrderedDict[DeckKey, Deck]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"draws": 0, "new_decks": 0, "reshuffles": 0, "evicted": 0}
+
+    def _shuffled(self, count: int, avoid_first: int = -1) -> array:
+        order = array("H" if count < 65536 else "I", range(count))
+        self._rng.shuffle(order)
+        # no back-to-back repeat across a reshuffle
+        if count > 1 and order[0] == avoid_first:
+            swap = self._rng.randrange(1, count)
+            order[0], order[swap] = order[swap], order[0]
+        return order
+
+    def draw(self, student_id: str, kind: str, topic: str, level: str, count: int) -> int:
+        """
+        Next unseen item index in [0, count) for this student's deck.
+        """
+        key = (student_id, kind, topic, level)
+        with self._lock:
+            self._stats["draws"] += 1
+            deck = self._decks.get(key)
+
+            if deck is None or len(deck.order) != count:
+                # new student, or the bank group changed size
+                deck = Deck(self._shuffled(count))
+                self._decks[key] = deck
+                self._stats["new_decks"] += 1
+                if len(self._decks) > self.max_decks:
+                    self._decks.popitem(last=False)
+                    self._stats["evicted"] += 1
+            else:
+                self._decks.move_to_end(key)
+                if deck.cursor >= count:
+                    deck.order = self._shuffled(count, avoid_first=deck.order[-1])
+                    deck.cursor = 0
+                    self._stats["reshuffles"] += 1
+
+            index = deck.order[deck.cursor]
+            deck.cursor += 1
+            return index
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["decks"] = len(self._decks)
+            stats["max_decks"] = self.max_decks
+            stats["deck_bytes"] = sum(
+                d.order.itemsize * len(d.order) for d in self._decks.values()
+            )
+            return stats
+
+
+sampler = DeckSampler()
@@ -0,0 +1,260 @@
+"""
+SQLite question bank for large, multi-topic banks.
+
+Items stay on disk; only the (kind, topic, level) -> count table is kept
+in memory. Random sampling picks a position in [0, count) and fetches it
+through the primary key, so it never scans or sorts a level.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+from dotenv import load_dotenv
+
+# =====================================================
+#                 ENV & PATHS
+# =====================================================
+
+load_dotenv()
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+DATA_DIR = BASE_DIR / "model_layer" / "data"
+
+BANK_DB_PATH = Path(
+    os.getenv("ASKORA_BANK_DB", DATA_DIR / "question_bank.sqlite3")
+)
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS groups (
+    kind  TEXT NOT NULL,
+    topic TEXT NOT NULL,
+    level TEXT NOT NULL,
+    n     INTEGER NOT NULL,
+    PRIMARY KEY (kind, topic, level)
+);
+
+-- pos is the 0-based position inside (kind, topic, level)
+CREATE TABLE IF NOT EXISTS items (
+    kind  TEXT NOT NULL,
+    topic TEXT NOT NULL,
+    level TEXT NOT NULL,
+    pos   INTEGER NOT NULL,
+    id    INTEGER NOT NULL,
+    body  TEXT NOT NULL,
+    PRIMARY KEY (kind, topic, level, pos)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_items_topic_id ON items (kind, topic, id);
+"""
+
+# =====================================================
+#                 IMPORT
+# =====================================================
+
+def _load_bank(path: Path) -> Tuple[bytes, Dict]:
+    """
+    Reads one bank file and checks its shape before anything is written.
+    Raises ValueError naming the file and the offending entry.
+    """
+    raw = Path(path).read_bytes()
+    try:
+        bank = json.loads(raw)
+    except ValueError as e:
+        raise ValueError(f"{path}: not valid JSON ({e})") from None
+
+    if not isinstance(bank, dict):
+        raise ValueError(f"{path}: expected an object of topics")
+    for topic, levels in bank.items():
+        if not isinstance(levels, dict):
+            raise ValueError(f"{path}: topic {topic!r} must map levels to item lists")
+        for level, items in levels.items():
+            if not isinstance(items, list):
+                raise ValueError(f"{path}: {topic!r}/{level!r} must be a list of items")
+            for i, item in enumerate(items):
+                if not isinstance(item, dict) or not isinstance(item.get("id"), int):
+                    raise ValueError(f"{path}: {topic!r}/{level!r} item {i} has no integer id")
+    return raw, bank
+
+
+def import_json(db_path: Path, banks: Dict[str, List[Path]], replace: bool = True) -> Dict[str, int]:
+    """
+    Load JSON banks ({kind: [files]}) into the database.
+    Files use the exercises.json / quizzes.json layout.
+
+    Every file is validated before the database is touched; ids must be
+    unique per kind and topic. A full import is built in a temporary file
+    and swapped in with os.replace, so running workers never see a
+    half-built bank. When appending, everything runs in one transaction
+    and an id already stored under the same kind and topic aborts it.
+    Bad input raises ValueError and leaves the database unchanged.
+    """
+    loaded = []
+    seen = set()
+    for kind, paths in banks.items():
+        for path in paths:
+            raw, bank = _load_bank(path)
+            for topic, levels in bank.items():
+                for items in levels.values():
+                    for item in items:
+                        key = (kind, topic, item["id"])
+                        if key in seen:
+                            raise ValueError(
+                                f"{path}: {kind} id {item['id']!r} appears twice in topic {topic!r}"
+                            )
+                        seen.add(key)
+            loaded.append((kind, path, raw, bank))
+
+    target = db_path.with_suffix(".tmp") if replace else db_path
+    if replace and target.exists():
+        target.unlink()
+
+    conn = sqlite3.connect(target)
+    stats = {kind: 0 for kind in banks}
+
+    try:
+        conn.executescript(SCHEMA)
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('schema_version', ?)",
+                (str(SCHEMA_VERSION),),
+            )
+
+            digest = hashlib.sha256()
+            row = conn.execute("SELECT value FROM meta WHERE key = 'content_version'").fetchone()
+            if row:
+                digest.update(row[0].encode())
+
+            for kind, path, raw, bank in loaded:
+                digest.update(raw)
+
+                for topic, levels in bank.items():
+                    for level, items in levels.items():
+                        row = conn.execute(
+                            "SELECT n FROM groups WHERE kind=? AND topic=? AND level=?",
+                            (kind, topic, level),
+                        ).fetchone()
+                        start = row[0] if row else 0
+
+                        if not replace and items:
+                            ids = [item["id"] for item in items]
+                            clash = conn.execute(
+                                "SELECT id FROM items WHERE kind=? AND topic=? AND id IN (%s) LIMIT 1"
+                                % ",".join("?" * len(ids)),
+                                (kind, topic, *ids),
+                            ).fetchone()
+                            if clash:
+                                raise ValueError(
+                                    f"{path}: {kind} id {clash[0]!r} already exists in topic {topic!r}"
+                                )
+
+                        conn.executemany(
+                            "INSERT INTO items VALUES (?, ?, ?, ?, ?, ?)",
+                            (
+                                (kind, topic, level, start + i, item["id"],
+                                 json.dumps(item, ensure_ascii=False))
+                                for i, item in enumerate(items)
+                            ),
+                        )
+                        conn.execute(
+                            "INSERT INTO groups VALUES (?, ?, ?, ?) "
+                            "ON CONFLICT (kind, topic, level) DO UPDATE SET n = excluded.n",
+                            (kind, topic, level, start + len(items)),
+                        )
+                        stats[kind] += len(items)
+
+            conn.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('content_version', ?)",
+                (digest.hexdigest()[:16],),
+            )
+
+        conn.execute("ANALYZE")
+    except BaseException:
+        conn.close()
+        if replace:
+            target.unlink(missing_ok=True)
+        raise
+
+    conn.close()
+    if replace:
+        target.replace(db_path)
+    return stats
+
+# =====================================================
+#                 READER
+# =====================================================
+
+class SqliteBank:
+    backend = "sqlite"
+
+    def __init__(self, db_path: Path = BANK_DB_PATH):
+        if not db_path.exists():
+            raise FileNotFoundError(
+                f"{db_path} not found; run python -m model_layer.tools.import_bank_sqlite"
+            )
+
+        self.db_path = db_path
+        self._local = threading.local()
+
+        row = self._conn().execute(
+            "SELECT value FROM meta WHERE key = 'content_version'"
+        ).fetchone()
+        self.content_version = row[0] if row else ""
+
+        self._groups: Dict[Tuple[str, str, str], int] = {}
+        self._levels: Dict[Tuple[str, str], List[str]] = {}
+        for kind, topic, level, n in self._conn().execute(
+            "SELECT kind, topic, level, n FROM groups ORDER BY rowid"
+        ):
+            self._groups[(kind, topic, level)] = n
+            self._levels.setdefault((kind, topic), []).append(level)
+
+    def _conn(self) -> sqlite3.Connection:
+        # one read-only connection per thread (FastAPI runs sync routes in a pool)
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                f"file:{self.db_path}?mode=ro", uri=True
+            )
+            self._local.conn = conn
+        return conn
+
+    def levels(self, kind: str, topic: str) -> List[str]:
+        return self._levels.get((kind, topic), [])
+
+    def count(self, kind: str, topic: str, level: str) -> int:
+        return self._groups.get((kind, topic, level), 0)
+
+    def item_at(self, kind: str, topic: str, level: str, index: int) -> Dict:
+        row = self._conn().execute(
+            "SELECT body FROM items WHERE kind=? AND topic=? AND level=? AND pos=?",
+            (kind, topic, level, index),
+        ).fetchone()
+        if row is None:
+            raise IndexError(index)
+        return json.loads(row[0])
+
+    def find(self, kind: str, topic: str, item_id: int) -> Optional[Dict]:
+        row = self._conn().execute(
+            "SELECT body FROM items WHERE kind=? AND topic=? AND id=? LIMIT 1",
+            (kind, topic, item_id),
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def iter_items(self, kind: str) -> Iterator[Tuple[str, str, Dict]]:
+        cursor = self._conn().execute(
+            "SELECT topic, level, body FROM items WHERE kind=? ORDER BY topic, level, pos",
+            (kind,),
+        )
+        for topic, level, body in cursor:
+            yield topic, level, json.loads(body)
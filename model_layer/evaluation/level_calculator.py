@@ -1,11 +1,16 @@
 import json
 from pathlib import Path
+from model_layer.bank.compiled import get_compiled
 
 BASE_DIR = Path(__file__).resolve().parents[1]
 RULES_PATH = BASE_DIR / "data" / "level_rules.json"
 
-with open(RULES_PATH, encoding="utf-8") as f:
-    LEVEL_RULES = json.load(f)
+_compiled = get_compiled()
+if _compiled:
+    LEVEL_RULES = _compiled.json_doc("level_rules")
+else:
+    with open(RULES_PATH, encoding="utf-8") as f:
+        LEVEL_RULES = json.load(f)
 
 
 def calculate_level(avg_score: float) -> str:
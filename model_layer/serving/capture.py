@@ -0,0 +1,160 @@
+"""
+Production traffic capture.
+
+With ASKORA_CAPTURE_SAMPLE > 0, a fraction of HTTP requests is written to a
+rotating JSONL file per worker process (ASKORA_CAPTURE_FILE with the pid
+appended, e.g. logs/capture-<pid>.jsonl), one line per request:
+
+    {"ts", "method", "path", "query", "body", "status", "latency_ms"}
+
+Headers are never recorded. Bodies and queries are sanitized: identifier
+fields (student_id) are replaced by a salted hash, so replays still see
+one consistent pseudonym per student, and e-mail addresses and long digit
+runs (phone / national id numbers) inside string values are masked.
+Lines are written by a background thread, off the event loop.
+model_layer.tools.replay_traffic re-drives these files.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import time
+from pathlib import Path
+from typing import Any, Optional
+from urllib.parse import parse_qsl, urlencode
+from dotenv import load_dotenv
+from model_layer.serving.jsonl_log import jsonl_logger
+
+# =====================================================
+#                 ENV
+# =====================================================
+
+load_dotenv()
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+
+CAPTURE_SAMPLE = float(os.getenv("ASKORA_CAPTURE_SAMPLE", "0"))
+CAPTURE_FILE = Path(os.getenv("ASKORA_CAPTURE_FILE", BASE_DIR / "logs" / "capture.jsonl"))
+CAPTURE_MAX_BYTES = int(os.getenv("ASKORA_CAPTURE_MAX_BYTES", str(50 * 1024 * 1024)))
+CAPTURE_BACKUPS = int(os.getenv("ASKORA_CAPTURE_BACKUPS", "10"))
+CAPTURE_SALT = os.getenv("ASKORA_CAPTURE_SALT", "")
+
+MAX_BODY_BYTES = 64 * 1024
+
+# =====================================================
+#                 SANITIZING
+# =====================================================
+
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+_DIGITS = re.compile(r"\d{7,}")
+
+IDENTIFIER_FIELDS = {"student_id"}
+
+
+def _pseudonym(value: Any) -> str:
+    digest = hashlib.sha256(f"{CAPTURE_SALT}:{value}".encode("utf-8")).hexdigest()
+    return f"anon-{digest[:16]}"
+
+
+def _scrub(text: str) -> str:
+    text = _EMAIL.sub("<email>", text)
+    return _DIGITS.sub(lambda m: "0" * len(m.group()), text)
+
+
+def _sanitize(value: Any) -> Any:
+    if isinstance(value, str):
+        return _scrub(value)
+    if isinstance(value, list):
+        return [_sanitize(v) for v in value]
+    if isinstance(value, dict):
+        return {
+            k: _pseudonym(v) if k in IDENTIFIER_FIELDS and v is not None else _sanitize(v)
+            for k, v in value.items()
+        }
+    return value
+
+
+def sanitize_query(raw: bytes) -> str:
+    pairs = parse_qsl(raw.decode("latin-1"), keep_blank_values=True)
+    return urlencode([
+        (k, _pseudonym(v) if k in IDENTIFIER_FIELDS else _scrub(v)) for k, v in pairs
+    ])
+
+
+def sanitize_body(raw: bytes) -> Optional[str]:
+    if not raw:
+        return None
+    text = raw.decode("utf-8", errors="replace")
+    try:
+        return json.dumps(_sanitize(json.loads(text)), ensure_ascii=False)
+    except ValueError:
+        return _scrub(text)
+
+# =====================================================
+#                 WRITER
+# =====================================================
+
+_logger: Optional[logging.Logger] = None
+
+
+def _writer() -> logging.Logger:
+    global _logger
+    if _logger is None:
+        _logger = jsonl_logger("askora.capture", CAPTURE_FILE, CAPTURE_MAX_BYTES, CAPTURE_BACKUPS)
+    return _logger
+
+# =====================================================
+#                 ASGI MIDDLEWARE
+# =====================================================
+
+class CaptureMiddleware:
+    def __init__(self, app, sample_rate: float = CAPTURE_SAMPLE):
+        self.app = app
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["path"].startswith(("/debug/", "/health/"))
+            or self.sample_rate <= 0
+            or random.random() >= self.sample_rate
+        ):
+            return await self.app(scope, receive, send)
+
+        started_at = time.time()
+        started = time.perf_counter()
+        chunks = []
+        size = 0
+        status = 0
+
+        async def capture_receive():
+            nonlocal size
+            message = await receive()
+            if message["type"] == "http.request" and size < MAX_BODY_BYTES:
+                body = message.get("body", b"")
+                chunks.append(body[:MAX_BODY_BYTES - size])
+                size += len(body)
+            return message
+
+        async def capture_send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, capture_receive, capture_send)
+        finally:
+            record = {
+                "ts": round(started_at, 6),
+                "method": scope["method"],
+                "path": scope["path"],
+                "query": sanitize_query(scope.get("query_string", b"")),
+                "body": sanitize_body(b"".join(chunks)),
+                "status": status,
+                "latency_ms": round((time.perf_counter() - started) * 1000, 3),
+            }
+            _writer().info(record)
@@ -0,0 +1,24 @@
+"""
+Fast JSON encoding with orjson (listed in requirements.txt). The compact
+stdlib encoder is only a fallback for environments without it.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # fallback only; requirements.txt installs orjson
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
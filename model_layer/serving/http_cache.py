@@ -0,0 +1,56 @@
+"""
+ETag / Cache-Control helpers for the cacheable GET routes.
+"""
+
+import hashlib
+import os
+from typing import Any, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from model_layer.serving.responses import FastJSONResponse
+
+MAX_AGE = int(os.getenv("ASKORA_HTTP_MAX_AGE", "3600"))
+CACHEABLE = f"public, max-age={MAX_AGE}"
+NOT_CACHEABLE = "no-store"
+
+
+def make_etag(key: Tuple) -> str:
+    digest = hashlib.sha256("\x1f".join(map(str, key)).encode("utf-8"))
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison
+    tags = (t.strip() for t in header.split(","))
+    return any(t.removeprefix("W/") == etag for t in tags)
+
+
+def cached_response(request: Request, key: Optional[Tuple], build) -> Response:
+    """
+    304 when the client already has this version, otherwise the body
+    from build() with ETag + Cache-Control. key=None means not cacheable.
+    """
+    if key is None:
+        return _with_headers(build(), {"Cache-Control": NOT_CACHEABLE})
+
+    etag = make_etag(key)
+    headers = {"ETag": etag, "Cache-Control": CACHEABLE}
+
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    return _with_headers(build(), headers)
+
+
+def _with_headers(content: Any, headers: dict) -> Response:
+    if isinstance(content, Response):
+        content.headers.update(headers)
+        return content
+    return FastJSONResponse(content, headers=headers)
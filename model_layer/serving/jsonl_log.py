@@ -0,0 +1,62 @@
+"""
+Rotating JSONL writer that keeps file I/O off the event loop.
+
+Callers log plain dicts; a QueueHandler hands them to a listener thread
+that serializes each one and writes it through a RotatingFileHandler.
+
+RotatingFileHandler needs a single writer per file: rotating from several
+processes loses and interleaves records. Each process therefore writes
+its own file, named after the configured path plus the pid
+(logs/traces.jsonl -> logs/traces-<pid>.jsonl).
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+
+
+class _JsonLineFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps(record.msg, ensure_ascii=False, default=str)
+
+
+class _PassThroughQueueHandler(QueueHandler):
+    # the default prepare() formats on the caller's thread; defer it
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def process_path(path: Path) -> Path:
+    return path.with_name(f"{path.stem}-{os.getpid()}{path.suffix}")
+
+
+def jsonl_logger(name: str, path: Path, max_bytes: int, backups: int) -> logging.Logger:
+    """
+    Logger writing to process_path(path); call it in the process that logs
+    (after uvicorn has started the worker), not before forking.
+    """
+    path = process_path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    file_handler = RotatingFileHandler(
+        path,
+        maxBytes=max_bytes,
+        backupCount=backups,
+        encoding="utf-8",
+    )
+    file_handler.setFormatter(_JsonLineFormatter())
+
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    listener = QueueListener(records, file_handler)
+    listener.start()
+    # flush what is still queued on shutdown
+    atexit.register(listener.stop)
+
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    logger.addHandler(_PassThroughQueueHandler(records))
+    return logger
@@ -0,0 +1,277 @@
+"""
+Opt-in profiling.
+
+Per request: a request carrying `X-Askora-Profile: <ASKORA_PROFILE_TOKEN>`
+(or a sampled fraction, ASKORA_PROFILE_SAMPLE) runs its whole route
+handler under cProfile: body parsing, the endpoint, response validation
+and rendering. The stats go to ASKORA_PROFILE_DIR as
+<route>-<trace id>.pstats. The event loop part of the profile may also
+show other requests' coroutines that ran in between. Before Python 3.12,
+response_model validation of sync endpoints runs on a pool thread that
+is not profiled.
+
+Whole process: a time-boxed sampling session collects the stacks of all
+threads every few milliseconds and writes them in collapsed-stack format
+(one "frame;frame;frame count" line per stack, ready for flamegraph tools).
+"""
+
+import cProfile
+import functools
+import hmac
+import inspect
+import os
+import pstats
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Dict, List, Optional
+from dotenv import load_dotenv
+from fastapi.routing import APIRoute
+from starlette.concurrency import run_in_threadpool
+
+from model_layer.serving.tracing import current_trace_id
+
+# =====================================================
+#                 ENV
+# =====================================================
+
+load_dotenv()
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+
+PROFILE_DIR = Path(os.getenv("ASKORA_PROFILE_DIR", BASE_DIR / "logs" / "profiles"))
+PROFILE_TOKEN = os.getenv("ASKORA_PROFILE_TOKEN", "")
+PROFILE_SAMPLE = float(os.getenv("ASKORA_PROFILE_SAMPLE", "0"))
+
+PROFILE_HEADER = b"x-askora-profile"
+
+MAX_SESSION_SECONDS = 300
+
+
+def is_admin(token: Optional[str]) -> bool:
+    """
+    Profiling is disabled entirely unless a token is configured.
+    """
+    if not PROFILE_TOKEN or token is None:
+        return False
+    return hmac.compare_digest(token.encode("utf-8"), PROFILE_TOKEN.encode("utf-8"))
+
+
+def _output_path(route: str, run_id: str, suffix: str) -> Path:
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    name = re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_") or "root"
+    return PROFILE_DIR / f"{name}-{run_id}{suffix}"
+
+# =====================================================
+#                 PER REQUEST
+# =====================================================
+
+_profile_request: ContextVar[Optional[str]] = ContextVar("askora_profile", default=None)
+# profilers collecting for the current request, merged into one file
+_profilers: ContextVar[Optional[List[cProfile.Profile]]] = ContextVar(
+    "askora_profilers", default=None
+)
+
+# one cProfile at a time: on Python 3.12+ a second active profiler raises
+_profiler_busy = threading.Lock()
+
+# before 3.12 a profiler only sees the thread that enabled it, so sync
+# endpoints need their own one on the pool thread
+_PER_THREAD = sys.version_info < (3, 12)
+
+
+class ProfilingMiddleware:
+    """
+    Marks requests that should be profiled; ProfilingRoute does the work
+    around the route handler.
+    """
+
+    def __init__(self, app, sample_rate: float = PROFILE_SAMPLE):
+        self.app = app
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith("/debug/"):
+            return await self.app(scope, receive, send)
+
+        wanted = self.sample_rate > 0 and random.random() < self.sample_rate
+        if not wanted and PROFILE_TOKEN:
+            for k, v in scope.get("headers", ()):
+                if k == PROFILE_HEADER:
+                    wanted = is_admin(v.decode("latin-1"))
+                    break
+
+        if not wanted:
+            return await self.app(scope, receive, send)
+
+        token = _profile_request.set(scope["path"])
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _profile_request.reset(token)
+
+
+def profiled(endpoint):
+    """
+    Wraps a sync endpoint so that, while its request is being profiled,
+    the pool thread running it is profiled too. A no-op on 3.12+, where
+    the route handler's profiler already sees every thread.
+    """
+    if inspect.iscoroutinefunction(endpoint) or not _PER_THREAD:
+        return endpoint
+
+    @functools.wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        profilers = _profilers.get()
+        if profilers is None:
+            return endpoint(*args, **kwargs)
+
+        profiler = cProfile.Profile()
+        profilers.append(profiler)
+        profiler.enable()
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            profiler.disable()
+
+    return wrapper
+
+
+def _dump(route: str, profilers: List[cProfile.Profile]):
+    run_id = current_trace_id() or uuid.uuid4().hex
+    pstats.Stats(*profilers).dump_stats(_output_path(route, run_id, ".pstats"))
+
+
+class ProfilingRoute(APIRoute):
+    """
+    Route class that runs marked requests' route handlers under cProfile,
+    so response serialization and rendering are in the profile. Unmarked
+    requests pay one ContextVar lookup; marked requests that arrive while
+    another one is being profiled run unprofiled.
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, profiled(endpoint), **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def profiled_handler(request):
+            route = _profile_request.get()
+            if route is None or not _profiler_busy.acquire(blocking=False):
+                return await handler(request)
+
+            profiler = cProfile.Profile()
+            profilers = [profiler]
+            token = _profilers.set(profilers)
+            try:
+                profiler.enable()
+                try:
+                    return await handler(request)
+                finally:
+                    profiler.disable()
+                    _profilers.reset(token)
+                    await run_in_threadpool(_dump, route, profilers)
+            finally:
+                _profiler_busy.release()
+
+        return profiled_handler
+
+# =====================================================
+#                 WHOLE PROCESS SAMPLING
+# =====================================================
+
+class SamplingSession:
+    def __init__(self, seconds: float, interval: float):
+        self.seconds = min(seconds, MAX_SESSION_SECONDS)
+        self.interval = interval
+        self.id = uuid.uuid4().hex[:12]
+        self.started = time.time()
+        self.samples = 0
+        self.stacks: Counter = Counter()
+        self.path: Optional[Path] = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="askora-profiler", daemon=True
+        )
+
+    def _run(self):
+        own = threading.get_ident()
+        names = {}
+        deadline = time.monotonic() + self.seconds
+
+        while not self._stop.is_set() and time.monotonic() < deadline:
+            for thread in threading.enumerate():
+                names[thread.ident] = thread.name
+
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.stacks[";".join(reversed(stack))] += 1
+
+            self.samples += 1
+            self._stop.wait(self.interval)
+
+        self.path = _output_path("process", self.id, ".collapsed")
+        with open(self.path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    @property
+    def running(self) -> bool:
+        return self._thread.is_alive()
+
+    def status(self) -> Dict:
+        return {
+            "id": self.id,
+            "running": self.running,
+            "seconds": self.seconds,
+            "interval_ms": round(self.interval * 1000, 3),
+            "samples": self.samples,
+            "file": str(self.path) if self.path else None,
+        }
+
+
+_session: Optional[SamplingSession] = None
+_session_lock = threading.Lock()
+
+
+def start_session(seconds: float = 30, interval_ms: float = 5) -> Dict:
+    global _session
+    with _session_lock:
+        if _session and _session.running:
+            return {"error": "PROFILE_ALREADY_RUNNING", **_session.status()}
+        _session = SamplingSession(seconds, max(interval_ms, 1) / 1000)
+        _session.start()
+        return _session.status()
+
+
+def stop_session() -> Dict:
+    with _session_lock:
+        if _session is None:
+            return {"error": "NO_PROFILE_SESSION"}
+        _session.stop()
+        return _session.status()
+
+
+def session_status() -> Dict:
+    return _session.status() if _session else {"running": False}
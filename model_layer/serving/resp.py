@@ -0,0 +1,110 @@
+"""
+Minimal Redis protocol (RESP2) client.
+
+Only what the shared generation cache needs: one blocking connection per
+thread, commands in, decoded replies out. Works against Redis, Valkey,
+KeyDB and model_layer.tools.resp_server.
+"""
+
+import socket
+import threading
+from typing import Any
+from urllib.parse import urlsplit
+
+
+class RespError(RuntimeError):
+    """
+    Error reply from the server (-ERR ...).
+    """
+
+
+def encode_command(*args) -> bytes:
+    out = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if not isinstance(arg, bytes):
+            arg = str(arg).encode("utf-8")
+        out.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(out)
+
+
+def read_reply(f) -> Any:
+    """
+    Reads one reply from a binary file object. Bulk strings come back as
+    bytes, nil as None, error replies as RespError instances.
+    """
+    line = f.readline()
+    if not line:
+        raise ConnectionError("connection closed")
+    kind, rest = line[:1], line[1:-2]
+
+    if kind == b"+":
+        return rest.decode("utf-8")
+    if kind == b"-":
+        return RespError(rest.decode("utf-8"))
+    if kind == b":":
+        return int(rest)
+    if kind == b"$":
+        size = int(rest)
+        if size < 0:
+            return None
+        data = f.read(size + 2)
+        return data[:-2]
+    if kind == b"*":
+        size = int(rest)
+        if size < 0:
+            return None
+        return [read_reply(f) for _ in range(size)]
+    raise ConnectionError(f"bad reply: {line!r}")
+
+
+class RespClient:
+    def __init__(self, url: str, timeout: float = 2.0):
+        parts = urlsplit(url)
+        self.host = parts.hostname or "127.0.0.1"
+        self.port = parts.port or 6379
+        self.db = int(parts.path.strip("/") or 0)
+        self.password = parts.password
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connect(self):
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        conn = (sock, sock.makefile("rb"))
+        self._local.conn = conn
+        if self.password:
+            self._roundtrip(conn, "AUTH", self.password)
+        if self.db:
+            self._roundtrip(conn, "SELECT", self.db)
+        return conn
+
+    def _roundtrip(self, conn, *args) -> Any:
+        sock, f = conn
+        sock.sendall(encode_command(*args))
+        reply = read_reply(f)
+        if isinstance(reply, RespError):
+            raise reply
+        return reply
+
+    def _close(self):
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+        if conn:
+            try:
+                conn[1].close()
+                conn[0].close()
+            except OSError:
+                pass
+
+    def execute(self, *args) -> Any:
+        """
+        Sends one command, reconnecting once if the connection went away.
+        """
+        for attempt in (0, 1):
+            conn = getattr(self._local, "conn", None) or self._connect()
+            try:
+                return self._roundtrip(conn, *args)
+            except (ConnectionError, OSError):
+                self._close()
+                if attempt:
+                    raise
@@ -0,0 +1,28 @@
+import os
+from typing import Any
+
+from fastapi.responses import Response
+
+from model_layer.serving.fast_json import dumps
+
+# ASKORA_FAST_RESPONSES=0 falls back to the stock FastAPI encoding path
+FAST_RESPONSES = os.getenv("ASKORA_FAST_RESPONSES", "1") == "1"
+
+
+class FastJSONResponse(Response):
+    """
+    Drop-in JSONResponse using the fastest available encoder.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class RawJSONResponse(Response):
+    """
+    Body that is already serialized JSON bytes (pre-serialized bank items).
+    """
+
+    media_type = "application/json"
@@ -0,0 +1,190 @@
+"""
+Lightweight request tracing with a rotating JSONL span exporter.
+
+Each sampled request gets a trace id; code inside it opens spans with
+
+    with span("rag.load", key=key) as s:
+        ...
+        s.set(bytes=len(text))
+
+Spans are buffered per trace and written as one JSON line each when the
+request ends, to ASKORA_TRACE_FILE with the worker's pid appended
+(logs/traces-<pid>.jsonl). Outside a sampled trace span() returns a shared no-op
+object, so instrumented code costs one ContextVar lookup.
+"""
+
+import logging
+import os
+import random
+import time
+import uuid
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from dotenv import load_dotenv
+from model_layer.serving.jsonl_log import jsonl_logger
+
+# =====================================================
+#                 ENV
+# =====================================================
+
+load_dotenv()
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+
+SAMPLE_RATE = float(os.getenv("ASKORA_TRACE_SAMPLE", "0"))
+TRACE_FILE = Path(os.getenv("ASKORA_TRACE_FILE", BASE_DIR / "logs" / "traces.jsonl"))
+TRACE_MAX_BYTES = int(os.getenv("ASKORA_TRACE_MAX_BYTES", str(20 * 1024 * 1024)))
+TRACE_BACKUPS = int(os.getenv("ASKORA_TRACE_BACKUPS", "5"))
+
+# clients (or operators) can force a trace for a single request
+FORCE_HEADER = b"x-askora-trace"
+
+# =====================================================
+#                 EXPORTER
+# =====================================================
+
+_logger: Optional[logging.Logger] = None
+
+
+def _exporter() -> logging.Logger:
+    global _logger
+    if _logger is None:
+        _logger = jsonl_logger("askora.traces", TRACE_FILE, TRACE_MAX_BYTES, TRACE_BACKUPS)
+    return _logger
+
+# =====================================================
+#                 SPANS
+# =====================================================
+
+class Trace:
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.spans: List[Dict[str, Any]] = []
+
+    def export(self):
+        log = _exporter()
+        # serialized and written by the exporter thread
+        for record in self.spans:
+            log.info(record)
+
+
+class Span:
+    __slots__ = ("trace", "record", "_start", "_token")
+
+    def __init__(self, trace: Trace, name: str, attrs: Dict[str, Any]):
+        parent = _span_id.get()
+        self.trace = trace
+        self.record = {
+            "trace_id": trace.trace_id,
+            "span_id": uuid.uuid4().hex[:16],
+            "parent_id": parent,
+            "name": name,
+            "start": time.time(),
+            "attrs": attrs,
+        }
+
+    def set(self, **attrs):
+        self.record["attrs"].update(attrs)
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        self._token = _span_id.set(self.record["span_id"])
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _span_id.reset(self._token)
+        self.record["duration_ms"] = round((time.perf_counter() - self._start) * 1000, 3)
+        if exc_type is not None:
+            self.record["error"] = f"{exc_type.__name__}: {exc}"
+        self.trace.spans.append(self.record)
+        return False
+
+
+class _NoopSpan:
+    def set(self, **attrs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+_trace: ContextVar[Optional[Trace]] = ContextVar("askora_trace", default=None)
+_span_id: ContextVar[Optional[str]] = ContextVar("askora_span", default=None)
+
+
+def span(name: str, **attrs):
+    trace = _trace.get()
+    if trace is None:
+        return NOOP_SPAN
+    return Span(trace, name, attrs)
+
+
+def event(name: str, **attrs):
+    """
+    Zero-length span, e.g. "fallback".
+    """
+    trace = _trace.get()
+    if trace is not None:
+        with Span(trace, name, attrs):
+            pass
+
+
+def current_trace_id() -> Optional[str]:
+    trace = _trace.get()
+    return trace.trace_id if trace else None
+
+# =====================================================
+#                 ASGI MIDDLEWARE
+# =====================================================
+
+class TracingMiddleware:
+    """
+    Starts a trace for a sampled fraction of HTTP requests (or when the
+    request carries `X-Askora-Trace: 1`) and echoes `X-Trace-Id`.
+    """
+
+    def __init__(self, app, sample_rate: float = SAMPLE_RATE):
+        self.app = app
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        forced = any(
+            k == FORCE_HEADER and v == b"1" for k, v in scope.get("headers", ())
+        )
+        if not forced and (self.sample_rate <= 0 or random.random() >= self.sample_rate):
+            return await self.app(scope, receive, send)
+
+        trace = Trace(uuid.uuid4().hex)
+        trace_token = _trace.set(trace)
+        root = Span(trace, "http.request", {
+            "method": scope["method"],
+            "path": scope["path"],
+        })
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                root.set(status=message["status"])
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (b"x-trace-id", trace.trace_id.encode())
+                ]
+            await send(message)
+
+        try:
+            with root:
+                await self.app(scope, receive, send_with_id)
+                route = scope.get("route")
+                if route is not None:
+                    root.set(route=getattr(route, "path", None))
+        finally:
+            _trace.reset(trace_token)
+            trace.export()
@@ -0,0 +1,93 @@
+"""
+Startup warmup and readiness.
+
+The app lifespan starts warmup in a background thread so /health/live
+answers immediately while /health/ready stays 503 until every step has
+run. A failing step is recorded but does not keep the worker out of
+rotation: a cold cache is still better than no capacity.
+"""
+
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+from model_layer.serving.tracing import span
+
+# =====================================================
+#                 ENV
+# =====================================================
+
+load_dotenv()
+
+WARMUP_ENABLED = os.getenv("ASKORA_WARMUP", "1") == "1"
+# probes cost one model call per model per worker start
+WARMUP_PROBE = os.getenv("ASKORA_WARMUP_PROBE", "0") == "1"
+
+Step = Tuple[str, Callable[[], object]]
+
+# =====================================================
+#                 STATE
+# =====================================================
+
+class WarmupState:
+    def __init__(self):
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.steps: List[Dict] = []
+        self._done = threading.Event()
+
+    @property
+    def ready(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    def run(self, steps: List[Step]):
+        self.started = time.time()
+        try:
+            for name, fn in steps:
+                started = time.perf_counter()
+                step = {"name": name}
+                with span("warmup.step", step=name) as s:
+                    try:
+                        step["result"] = fn()
+                        step["status"] = "ok"
+                    except Exception as e:
+                        print(f"[Warmup Error] {name}:", e)
+                        step["status"] = "error"
+                        step["error"] = str(e)
+                    s.set(status=step["status"])
+                step["ms"] = round((time.perf_counter() - started) * 1000, 1)
+                self.steps.append(step)
+        finally:
+            self.finished = time.time()
+            self._done.set()
+
+    def status(self) -> Dict:
+        return {
+            "ready": self.ready,
+            "seconds": round((self.finished or time.time()) - self.started, 3)
+            if self.started else 0.0,
+            # copy: the warmup thread may still be appending
+            "steps": list(self.steps),
+        }
+
+
+state = WarmupState()
+
+
+def start(steps: List[Step]) -> threading.Thread:
+    """
+    Runs the steps in a daemon thread. With ASKORA_WARMUP=0 the worker
+    is ready at once.
+    """
+    thread = threading.Thread(
+        target=state.run,
+        args=(steps if WARMUP_ENABLED else [],),
+        name="askora-warmup",
+        daemon=True,
+    )
+    thread.start()
+    return thread
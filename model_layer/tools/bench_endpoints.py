@@ -0,0 +1,122 @@
+"""
+In-process endpoint throughput benchmark.
+
+Drives the ASGI app directly (no sockets, no HTTP client) so the numbers
+reflect routing, validation and serialization cost only. Each mode runs in
+its own process, e.g. with and without the pre-serialized fast path.
+
+Single runs are noisy (CPU frequency, other load), so modes are run
+--rounds times, interleaved and alternating order each round. The report
+gives the median rate per mode with its min-max spread, and the median
+of the per-round speedups with their range.
+
+Usage (from the repo root):
+    python -m model_layer.tools.bench_endpoints [--requests 5000] [--rounds 5]
+        [--modes ASKORA_FAST_RESPONSES=0,ASKORA_FAST_RESPONSES=1]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from model_layer.tools.asgi_driver import asgi_request
+
+ROOT = Path(__file__).resolve().parents[2]
+
+CASES = [
+    ("/quiz", {"topic": "Event-Driven Programming", "level": "Beginner"}),
+    ("/exercise", {"topic": "Object-Oriented Programming", "level": "Intermediate"}),
+    ("/quiz/evaluate", {"topic": "Event-Driven Programming", "quiz_id": 1, "student_choice_index": 0}),
+    ("/student/level", {"scores": [3, 4.5, 2, 5, 4]}),
+]
+
+
+async def call(app, path: str, body: bytes) -> int:
+    status, _ = await asgi_request(app, "POST", path, body=body)
+    return status
+
+
+async def run_cases(n: int) -> dict:
+    from app import app
+
+    results = {}
+    for path, payload in CASES:
+        body = json.dumps(payload).encode()
+        for _ in range(min(n // 10, 200)):
+            await call(app, path, body)
+
+        start = time.perf_counter()
+        for _ in range(n):
+            status = await call(app, path, body)
+            assert status == 200, (path, status)
+        elapsed = time.perf_counter() - start
+        results[path] = n / elapsed
+    return results
+
+
+def worker(n: int):
+    print(json.dumps(asyncio.run(run_cases(n))))
+
+
+def run_mode(mode: str, n: int) -> Dict[str, float]:
+    key, _, value = mode.partition("=")
+    out = subprocess.run(
+        [sys.executable, "-m", "model_layer.tools.bench_endpoints",
+         "--worker", "--requests", str(n)],
+        cwd=ROOT, env=dict(os.environ, **{key: value}),
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def spread(values: List[float]) -> str:
+    median = statistics.median(values)
+    low = 100 * (min(values) / median - 1)
+    high = 100 * (max(values) / median - 1)
+    return f"{median:.0f} ({low:+.0f}/{high:+.0f}%)"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument(
+        "--modes",
+        default="ASKORA_FAST_RESPONSES=0,ASKORA_FAST_RESPONSES=1",
+        help="comma separated ENV=VALUE settings, one run each",
+    )
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.requests)
+        return
+
+    modes = args.modes.split(",")
+    # mode -> one result dict per round
+    runs: Dict[str, List[Dict[str, float]]] = {m: [] for m in modes}
+    for i in range(max(args.rounds, 1)):
+        # alternate the order so drift does not favour one mode
+        for mode in (modes if i % 2 == 0 else modes[::-1]):
+            runs[mode].append(run_mode(mode, args.requests))
+
+    print(f"{args.rounds} rounds x {args.requests} requests; r/s median (min/max vs median)\n")
+    print(f"{'endpoint':<16}" + "".join(f"{m:>32}" for m in modes) + f"{'speedup':>24}")
+    for path, _ in CASES:
+        rates = [[r[path] for r in runs[m]] for m in modes]
+        ratios = [last / first for first, last in zip(rates[0], rates[-1])]
+        print(
+            f"{path:<16}" + "".join(f"{spread(r):>32}" for r in rates)
+            + f"{statistics.median(ratios):>10.2f}x [{min(ratios):.2f}-{max(ratios):.2f}]"
+        )
+
+
+if __name__ == "__main__":
+    main()
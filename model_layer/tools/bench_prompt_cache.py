@@ -0,0 +1,97 @@
+"""
+Prompt prefix caching benchmark against the offline LLM stand-in.
+
+Sends explanation and tutor prompts through call_gemini with
+ASKORA_LLM_BACKEND=local, once with the context cache off and once on,
+each in its own process, and compares uncached prompt tokens and
+latency per call.
+
+Usage (from the repo root):
+    python -m model_layer.tools.bench_prompt_cache [--rounds 5]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+MODES = ["ASKORA_PROMPT_CACHE=0", "ASKORA_PROMPT_CACHE=1"]
+
+
+def worker(rounds: int) -> dict:
+    from model_layer.ai.ai_tutor_generator import build_tutor_prompt
+    from model_layer.ai.explanation_generator import (
+        ALLOWED_LEVELS,
+        TOPIC_MAP,
+        build_explanation_prompt,
+    )
+    from model_layer.ai.gemini_client import call_gemini
+    from model_layer.ai.prompt_cache import context_cache
+
+    prompts = []
+    for topic in TOPIC_MAP:
+        for level in ALLOWED_LEVELS:
+            prompts.append(build_explanation_prompt(topic, level))
+            prompts.append(build_tutor_prompt(topic, level, ["Class", "Object"]))
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for prompt in prompts:
+            call_gemini(prompt)
+    elapsed = time.perf_counter() - started
+
+    stats = context_cache.stats()
+    calls = max(stats["calls"], 1)
+    return {
+        "calls": stats["calls"],
+        "ms_per_call": 1000 * elapsed / calls,
+        "prompt_tokens": stats["prompt_tokens"] / calls,
+        "uncached_tokens": (stats["prompt_tokens"] - stats["cached_tokens"]) / calls,
+        "registered": stats["registered"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(worker(args.rounds)))
+        return
+
+    runs = {}
+    for mode in MODES:
+        key, _, value = mode.partition("=")
+        out = subprocess.run(
+            [sys.executable, "-m", "model_layer.tools.bench_prompt_cache",
+             "--worker", "--rounds", str(args.rounds)],
+            cwd=ROOT, env=dict(
+                os.environ,
+                ASKORA_LLM_BACKEND="local",
+                # every call must reach the model
+                ASKORA_SHARED_CACHE="off",
+                # register whatever the stand-in accepts
+                ASKORA_PROMPT_CACHE_MIN_TOKENS=os.getenv("ASKORA_LOCAL_LLM_MIN_CACHE_TOKENS", "0"),
+                **{key: value},
+            ),
+            capture_output=True, text=True, check=True,
+        )
+        runs[mode] = json.loads(out.stdout.strip().splitlines()[-1])
+
+    print(f"{'mode':<24}{'calls':>7}{'ms/call':>10}{'prompt tok':>12}{'uncached tok':>14}{'caches':>8}")
+    for mode, r in runs.items():
+        print(
+            f"{mode:<24}{r['calls']:>7}{r['ms_per_call']:>10.1f}"
+            f"{r['prompt_tokens']:>12.0f}{r['uncached_tokens']:>14.0f}{r['registered']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Startup time and per-worker memory of the data layer, per backend.
+
+Starts N worker processes per backend, each loading the question bank,
+level rules, criteria and RAG text, and reports load time, RSS and PSS
+(proportional set size: shared pages are split between the workers).
+The compiled and SQLite backends are measured on artifacts built from
+the shipped JSON into a temporary directory, so a clean checkout works
+and the real data files are left alone.
+
+Usage (from the repo root):
+    python -m model_layer.tools.bench_startup [--workers 4] [--backends json,compiled,sqlite]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parents[2]
+DATA_DIR = ROOT / "model_layer" / "data"
+
+WORKER = r"""
+import json, sys, time
+
+t0 = time.perf_counter()
+from model_layer.bank.question_bank import load_bank
+from model_layer.evaluation.level_calculator import LEVEL_RULES
+from model_layer.ai.rag_store import read_rag
+
+bank = load_bank()
+for kind in ("exercise", "quiz"):
+    for _ in bank.iter_items(kind):
+        pass
+for key in ("event_driven", "oop", "procedural"):
+    read_rag(key)
+startup_ms = (time.perf_counter() - t0) * 1000
+
+print("ready", flush=True)
+sys.stdin.readline()
+
+mem = {}
+with open("/proc/self/smaps_rollup") as f:
+    for line in f:
+        parts = line.split()
+        if parts[0] in ("Rss:", "Pss:", "Private_Dirty:", "Shared_Clean:"):
+            mem[parts[0][:-1]] = int(parts[1])
+print(json.dumps({"startup_ms": startup_ms, **mem}), flush=True)
+"""
+
+
+def prepare(backend: str, tmp: Path) -> Dict[str, str]:
+    """
+    Builds the backend's artifact under tmp; returns the env pointing at it.
+    """
+    if backend == "compiled":
+        from model_layer.bank.compiled import compile_data
+
+        path = tmp / "askora_data.bin"
+        compile_data(path)
+        return {"ASKORA_COMPILED_DATA": str(path)}
+    if backend == "sqlite":
+        from model_layer.bank.sqlite_store import import_json
+
+        path = tmp / "question_bank.sqlite3"
+        import_json(path, {
+            "exercise": [DATA_DIR / "exercises.json"],
+            "quiz": [DATA_DIR / "quizzes.json"],
+        })
+        return {"ASKORA_BANK_DB": str(path)}
+    if backend == "json":
+        return {}
+    raise SystemExit(f"unknown backend: {backend}")
+
+
+def _fail(procs: List[subprocess.Popen], backend: str, dead: subprocess.Popen):
+    status = dead.wait()
+    for p in procs:
+        p.kill()
+    raise SystemExit(f"{backend} worker exited with status {status}; see its traceback above")
+
+
+def run_backend(backend: str, workers: int, tmp: Path) -> dict:
+    env = dict(os.environ, ASKORA_DATA_BACKEND=backend, **prepare(backend, tmp))
+    procs = [
+        subprocess.Popen(
+            [sys.executable, "-c", WORKER],
+            cwd=ROOT, env=env, text=True,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+        )
+        for _ in range(workers)
+    ]
+
+    # keep every worker alive until all are loaded so PSS sees the sharing
+    for p in procs:
+        if p.stdout.readline().strip() != "ready":
+            _fail(procs, backend, p)
+
+    results = []
+    for p in procs:
+        p.stdin.write("\n")
+        p.stdin.flush()
+        line = p.stdout.readline()
+        if not line:
+            _fail(procs, backend, p)
+        results.append(json.loads(line))
+    for p in procs:
+        if p.wait() != 0:
+            _fail(procs, backend, p)
+
+    return {
+        key: statistics.mean(r[key] for r in results)
+        for key in results[0]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--backends", default="json,compiled,sqlite")
+    args = parser.parse_args()
+
+    print(f"{'backend':<10} {'startup ms':>10} {'RSS kB':>9} {'PSS kB':>9} {'private kB':>11}")
+    with tempfile.TemporaryDirectory(prefix="askora-bench-") as tmp:
+        for backend in args.backends.split(","):
+            r = run_backend(backend, args.workers, Path(tmp))
+            print(
+                f"{backend:<10} {r['startup_ms']:>10.2f} {r['Rss']:>9.0f} "
+                f"{r['Pss']:>9.0f} {r['Private_Dirty']:>11.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
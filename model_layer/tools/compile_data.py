@@ -0,0 +1,28 @@
+"""
+Compile question banks, level rules, criteria and RAG text into the
+mmap-able data artifact used with ASKORA_DATA_BACKEND=compiled.
+
+Usage (from the repo root):
+    python -m model_layer.tools.compile_data [--out PATH]
+"""
+
+import argparse
+from pathlib import Path
+
+from model_layer.bank.compiled import COMPILED_PATH, compile_data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--out", type=Path, default=COMPILED_PATH)
+    args = parser.parse_args()
+
+    info = compile_data(args.out)
+    print(
+        f"{info['items']} items in {info['groups']} groups, {info['docs']} docs, "
+        f"{info['bytes']} bytes, hash {info['content_hash']} -> {info['path']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Import JSON question banks into the SQLite backend
+(ASKORA_DATA_BACKEND=sqlite).
+
+Usage (from the repo root):
+    python -m model_layer.tools.import_bank_sqlite [--db PATH]
+        [--exercises FILE ...] [--quizzes FILE ...] [--append]
+
+Several files per kind can be given to load a full curriculum; items of
+the same (topic, level) are concatenated. With --append only the files
+named on the command line are loaded, and an id that already exists in
+its topic aborts the whole import. A failed import leaves the database
+as it was.
+"""
+
+import argparse
+import sqlite3
+from pathlib import Path
+
+from model_layer.bank.sqlite_store import BANK_DB_PATH, import_json
+
+DATA_DIR = Path(__file__).resolve().parents[1] / "data"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db", type=Path, default=BANK_DB_PATH)
+    parser.add_argument("--exercises", type=Path, nargs="+")
+    parser.add_argument("--quizzes", type=Path, nargs="+")
+    parser.add_argument("--append", action="store_true", help="add to an existing database")
+    args = parser.parse_args()
+
+    if args.append:
+        # the shipped bank is already in the database; only add what was named
+        if not args.exercises and not args.quizzes:
+            parser.error("--append needs --exercises and/or --quizzes")
+        banks = {"exercise": args.exercises or [], "quiz": args.quizzes or []}
+    else:
+        banks = {
+            "exercise": args.exercises or [DATA_DIR / "exercises.json"],
+            "quiz": args.quizzes or [DATA_DIR / "quizzes.json"],
+        }
+
+    try:
+        stats = import_json(args.db, banks, replace=not args.append)
+    except (OSError, ValueError, sqlite3.Error) as e:
+        parser.exit(1, f"import aborted: {e}\n")
+    print(f"exercises={stats['exercise']} quizzes={stats['quiz']} -> {args.db}")
+
+
+if __name__ == "__main__":
+    main()
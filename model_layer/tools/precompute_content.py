@@ -0,0 +1,194 @@
+"""
+Pre-render every static LLM answer into a versioned artifact.
+
+Covers (topic, level) explanations and (topic, level, focus_points) tutor
+texts, enumerated from TOPIC_MAP, ALLOWED_LEVELS and exercises.json.
+Entries are keyed by prompt hash, so a changed prompt or RAG file simply
+misses and is generated live.
+
+Usage (from the repo root):
+    python -m model_layer.tools.precompute_content [--workers 4] [--rpm 60]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# generated content must come from the model, not from the workers'
+# shared generation cache; set before model_layer.ai is imported
+os.environ["ASKORA_SHARED_CACHE"] = "off"
+
+from model_layer.ai import prerendered
+from model_layer.ai.ai_tutor_generator import build_tutor_prompt
+from model_layer.ai.explanation_generator import (
+    ALLOWED_LEVELS,
+    TOPIC_MAP,
+    build_explanation_prompt,
+)
+from model_layer.ai.gemini_client import call_gemini
+
+DATA_DIR = Path(__file__).resolve().parents[1] / "data"
+
+MIN_LENGTH = 40
+
+# =====================================================
+#                 ENUMERATION
+# =====================================================
+
+def enumerate_jobs(exercises: Dict) -> List[Dict]:
+    jobs = []
+
+    for topic in TOPIC_MAP:
+        for level in ALLOWED_LEVELS:
+            jobs.append({
+                "kind": "explanation",
+                "topic": topic,
+                "level": level,
+                "prompt": build_explanation_prompt(topic, level),
+            })
+
+            focus_sets: List[Optional[List[str]]] = [None]
+            for items in exercises.get(topic, {}).values():
+                for item in items:
+                    points = item.get("expected_points") or None
+                    if points not in focus_sets:
+                        focus_sets.append(points)
+
+            for focus_points in focus_sets:
+                jobs.append({
+                    "kind": "tutor",
+                    "topic": topic,
+                    "level": level,
+                    "focus_points": focus_points,
+                    "prompt": build_tutor_prompt(topic, level, focus_points),
+                })
+
+    for job in jobs:
+        job["hash"] = prerendered.prompt_hash(job["prompt"])
+    return jobs
+
+# =====================================================
+#                 GENERATION
+# =====================================================
+
+class RateLimiter:
+    """
+    Spaces calls at least 60/rpm seconds apart across all threads.
+    """
+
+    def __init__(self, rpm: float):
+        self.interval = 60.0 / rpm if rpm > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next = time.monotonic()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        time.sleep(max(0.0, start - now))
+
+
+def validate(text: Optional[str]) -> bool:
+    if not text or len(text.strip()) < MIN_LENGTH:
+        return False
+    # prompts forbid Markdown
+    if "```" in text or "**" in text:
+        return False
+    return not any(line.lstrip().startswith("#") for line in text.splitlines())
+
+
+def _generate(job: Dict, limiter: RateLimiter, retries: int) -> Optional[str]:
+    for _ in range(retries + 1):
+        limiter.wait()
+        text = call_gemini(job["prompt"], accept=validate)
+        if validate(text):
+            return text.strip()
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--exercises", type=Path, default=DATA_DIR / "exercises.json")
+    parser.add_argument("--out", type=Path, default=prerendered.ARTIFACT_PATH)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--rpm", type=float, default=60, help="max model calls per minute (0 = unlimited)")
+    parser.add_argument("--retries", type=int, default=1)
+    parser.add_argument("--force", action="store_true", help="regenerate existing entries")
+    args = parser.parse_args()
+
+    with open(args.exercises, encoding="utf-8") as f:
+        exercises = json.load(f)
+
+    jobs = enumerate_jobs(exercises)
+
+    existing: Dict[str, Dict] = {}
+    if args.out.exists() and not args.force:
+        with open(args.out, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") == prerendered.ARTIFACT_VERSION:
+            existing = data.get("items", {})
+
+    items: Dict[str, Dict] = {}
+    todo = []
+    for job in jobs:
+        if job["hash"] in existing:
+            items[job["hash"]] = existing[job["hash"]]
+        else:
+            todo.append(job)
+
+    print(f"{len(jobs)} prompts, {len(items)} reused, {len(todo)} to generate")
+
+    limiter = RateLimiter(args.rpm)
+    failed = 0
+
+    with ThreadPoolExecutor(max_workers=max(args.workers, 1)) as pool:
+        futures = {pool.submit(_generate, job, limiter, args.retries): job for job in todo}
+        for future in as_completed(futures):
+            job = futures[future]
+            text = future.result()
+            if text is None:
+                failed += 1
+                print(f"  FAILED {job['kind']} {job['topic']} / {job['level']}")
+                continue
+
+            items[job["hash"]] = {
+                "kind": job["kind"],
+                "topic": job["topic"],
+                "level": job["level"],
+                "focus_points": job.get("focus_points"),
+                "text": text,
+            }
+
+    hashes = sorted(items)
+    # covers the texts too: --force or a retried entry changes the version
+    digest = hashlib.sha256()
+    for h in hashes:
+        digest.update(h.encode())
+        digest.update(items[h]["text"].encode("utf-8"))
+    artifact = {
+        "version": prerendered.ARTIFACT_VERSION,
+        "content_version": digest.hexdigest()[:16],
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "items": {h: items[h] for h in hashes},
+    }
+
+    tmp = args.out.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(artifact, f, ensure_ascii=False, indent=1)
+    tmp.replace(args.out)
+
+    print(f"wrote {len(items)} entries ({failed} failed) -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Pregenerate exercise feedback for every covered-point pattern.
+
+Usage (from the repo root):
+    python -m model_layer.tools.pregenerate_feedback [--force] [--out PATH]
+"""
+
+import argparse
+import json
+import os
+from pathlib import Path
+
+# generated content must come from the model, not from the workers'
+# shared generation cache; set before model_layer.ai is imported
+os.environ["ASKORA_SHARED_CACHE"] = "off"
+
+from model_layer.ai import feedback_cache
+
+DATA_DIR = Path(__file__).resolve().parents[1] / "data"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--exercises", type=Path, default=DATA_DIR / "exercises.json")
+    parser.add_argument("--out", type=Path, default=feedback_cache.CACHE_PATH)
+    parser.add_argument("--force", action="store_true", help="regenerate cached patterns")
+    args = parser.parse_args()
+
+    with open(args.exercises, encoding="utf-8") as f:
+        exercises = json.load(f)
+
+    feedback_cache.load_cache(args.out)
+    stats = feedback_cache.pregenerate(exercises, force=args.force)
+    total = feedback_cache.save_cache(args.out)
+
+    print(
+        f"generated={stats['generated']} skipped={stats['skipped']} "
+        f"failed={stats['failed']} pruned={stats['pruned']} total={total} -> {args.out}"
+    )
+
+
+if __name__ == "__main__":
+    main()
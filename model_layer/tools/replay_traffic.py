@@ -0,0 +1,181 @@
+"""
+Replay captured traffic and report latency per endpoint.
+
+Reads capture files written by CaptureMiddleware (ASKORA_CAPTURE_SAMPLE),
+one per worker process, merges them in timestamp order and re-drives them
+either against a running instance (--target) or against the app
+in-process, with the LLM served from a record/replay cassette so runs are
+deterministic.
+
+Usage (from the repo root):
+    python -m model_layer.tools.replay_traffic logs/capture-*.jsonl
+        [--speed 1]            1 = original pacing, 5 = 5x faster, 0 = as fast as possible
+        [--concurrency 32]
+        [--target http://127.0.0.1:8000]
+        [--llm replay|record|gemini] [--cassette PATH]
+"""
+
+import argparse
+import asyncio
+import http.client
+import json
+import os
+import statistics
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List
+from urllib.parse import urlsplit
+
+
+def load_capture(paths: List[Path]) -> List[Dict]:
+    records = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            records.extend(json.loads(line) for line in f if line.strip())
+    records.sort(key=lambda r: r["ts"])
+    return records
+
+
+def percentile(values: List[float], q: float) -> float:
+    values = sorted(values)
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, round(q * (len(values) - 1))))
+    return values[index]
+
+# =====================================================
+#                 SENDERS
+# =====================================================
+
+def make_remote_sender(target: str):
+    url = urlsplit(target)
+
+    def send_sync(record: Dict) -> int:
+        conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=120)
+        path = record["path"] + (f"?{record['query']}" if record.get("query") else "")
+        body = (record.get("body") or "").encode("utf-8")
+        try:
+            conn.request(
+                record["method"], path, body=body or None,
+                headers={"Content-Type": "application/json"},
+            )
+            response = conn.getresponse()
+            response.read()
+            return response.status
+        finally:
+            conn.close()
+
+    async def send(record: Dict) -> int:
+        return await asyncio.to_thread(send_sync, record)
+
+    return send
+
+
+def make_inprocess_sender():
+    from app import app
+    from model_layer.tools.asgi_driver import asgi_request
+
+    async def send(record: Dict) -> int:
+        status, _ = await asgi_request(
+            app,
+            record["method"],
+            record["path"],
+            query=(record.get("query") or "").encode("latin-1"),
+            body=(record.get("body") or "").encode("utf-8"),
+        )
+        return status
+
+    return send
+
+# =====================================================
+#                 REPLAY
+# =====================================================
+
+async def replay(records: List[Dict], send, speed: float, concurrency: int) -> List[Dict]:
+    semaphore = asyncio.Semaphore(concurrency)
+    results = []
+    origin = records[0]["ts"] if records else 0.0
+    start = time.perf_counter()
+
+    async def one(record: Dict):
+        if speed > 0:
+            delay = (record["ts"] - origin) / speed - (time.perf_counter() - start)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        async with semaphore:
+            t0 = time.perf_counter()
+            try:
+                status = await send(record)
+            except Exception as e:
+                print("[Replay Error]:", e)
+                status = 0
+            results.append({
+                "endpoint": f"{record['method']} {record['path']}",
+                "status": status,
+                "latency_ms": (time.perf_counter() - t0) * 1000,
+                "captured_ms": record.get("latency_ms"),
+            })
+
+    await asyncio.gather(*(one(r) for r in records))
+    return results
+
+
+def report(results: List[Dict], wall: float):
+    by_endpoint = defaultdict(list)
+    for r in results:
+        by_endpoint[r["endpoint"]].append(r)
+
+    print(f"{len(results)} requests in {wall:.2f}s ({len(results) / max(wall, 1e-9):.1f} r/s)\n")
+    print(
+        f"{'endpoint':<26}{'n':>6}{'err':>5}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}"
+        f"{'mean':>9}{'capt p50':>10}{'capt p99':>10}"
+    )
+    for endpoint in sorted(by_endpoint):
+        rows = by_endpoint[endpoint]
+        lat = [r["latency_ms"] for r in rows]
+        captured = [r["captured_ms"] for r in rows if r["captured_ms"] is not None]
+        errors = sum(1 for r in rows if r["status"] == 0 or r["status"] >= 500)
+        print(
+            f"{endpoint:<26}{len(rows):>6}{errors:>5}"
+            f"{percentile(lat, .5):>9.1f}{percentile(lat, .9):>9.1f}"
+            f"{percentile(lat, .99):>9.1f}{max(lat):>9.1f}{statistics.mean(lat):>9.1f}"
+            f"{percentile(captured, .5):>10.1f}{percentile(captured, .99):>10.1f}"
+        )
+    print("\nlatencies in ms; 'capt' = latency recorded at capture time")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("captures", type=Path, nargs="+")
+    parser.add_argument("--speed", type=float, default=1.0)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--target", help="base URL of a running instance")
+    parser.add_argument("--llm", default="replay", choices=["replay", "record", "gemini"])
+    parser.add_argument("--cassette", type=Path)
+    args = parser.parse_args()
+
+    records = load_capture(args.captures)
+    if not records:
+        print("no captured requests")
+        return
+
+    if args.target:
+        send = make_remote_sender(args.target)
+    else:
+        # must be set before the app (and gemini_client) is imported
+        os.environ["ASKORA_LLM_BACKEND"] = args.llm
+        # deterministic runs; replayed answers must not reach the host's cache
+        os.environ["ASKORA_SHARED_CACHE"] = "off"
+        if args.cassette:
+            os.environ["ASKORA_LLM_CASSETTE"] = str(args.cassette)
+        send = make_inprocess_sender()
+
+    start = time.perf_counter()
+    results = asyncio.run(replay(records, send, args.speed, max(args.concurrency, 1)))
+    report(results, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
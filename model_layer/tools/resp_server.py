@@ -0,0 +1,150 @@
+"""
+Local Redis-protocol stand-in for testing ASKORA_SHARED_CACHE=redis.
+
+Single-process, in-memory, with the commands the shared cache uses
+(PING, GET, SET [EX|PX] [NX], DEL, DBSIZE, FLUSHDB) and allkeys-lru
+eviction above --maxmemory bytes of values.
+
+Usage (from the repo root):
+    python -m model_layer.tools.resp_server [--port 6379] [--maxmemory 67108864]
+    ASKORA_SHARED_CACHE=redis ASKORA_SHARED_CACHE_URL=redis://127.0.0.1:6379/0 uvicorn app:app --workers 4
+"""
+
+import argparse
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+
+class Store:
+    def __init__(self, maxmemory: int):
+        self.maxmemory = maxmemory
+        self.used = 0
+        # key -> (value, expires at or None); order = LRU
+        self.data: "OrderedDict[bytes, Tuple[bytes, Optional[float]]]" = OrderedDict()
+
+    def _live(self, key: bytes) -> Optional[bytes]:
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] < time.monotonic():
+            self.delete(key)
+            return None
+        self.data.move_to_end(key)
+        return entry[0]
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        return self._live(key)
+
+    def set(self, key: bytes, value: bytes, ttl: Optional[float], nx: bool) -> bool:
+        if nx and self._live(key) is not None:
+            return False
+        self.delete(key)
+        self.data[key] = (value, time.monotonic() + ttl if ttl else None)
+        self.used += len(value)
+        while self.maxmemory and self.used > self.maxmemory and len(self.data) > 1:
+            oldest = next(iter(self.data))
+            self.delete(oldest)
+        return True
+
+    def delete(self, key: bytes) -> int:
+        entry = self.data.pop(key, None)
+        if entry is None:
+            return 0
+        self.used -= len(entry[0])
+        return 1
+
+
+def _simple(text: str) -> bytes:
+    return f"+{text}\r\n".encode()
+
+
+def _bulk(value: Optional[bytes]) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    return b"$%d\r\n%s\r\n" % (len(value), value)
+
+
+def _int(n: int) -> bytes:
+    return b":%d\r\n" % n
+
+
+def handle(store: Store, args) -> bytes:
+    cmd = args[0].upper()
+
+    if cmd == b"PING":
+        return _simple("PONG")
+    if cmd in (b"SELECT", b"AUTH", b"CLIENT"):
+        return _simple("OK")
+    if cmd == b"GET":
+        return _bulk(store.get(args[1]))
+    if cmd == b"SET":
+        ttl, nx = None, False
+        options = [a.upper() for a in args[3:]]
+        for i, option in enumerate(options):
+            if option == b"EX":
+                ttl = float(args[4 + i])
+            elif option == b"PX":
+                ttl = float(args[4 + i]) / 1000
+            elif option == b"NX":
+                nx = True
+        return _simple("OK") if store.set(args[1], args[2], ttl, nx) else _bulk(None)
+    if cmd == b"DEL":
+        return _int(sum(store.delete(k) for k in args[1:]))
+    if cmd == b"DBSIZE":
+        return _int(len(store.data))
+    if cmd == b"FLUSHDB":
+        store.data.clear()
+        store.used = 0
+        return _simple("OK")
+    return f"-ERR unknown command '{cmd.decode(errors='replace')}'\r\n".encode()
+
+
+async def read_command(reader: asyncio.StreamReader):
+    line = await reader.readline()
+    if not line:
+        return None
+    if not line.startswith(b"*"):
+        # inline command (e.g. typed into telnet)
+        return line.split()
+    args = []
+    for _ in range(int(line[1:-2])):
+        size = int((await reader.readline())[1:-2])
+        args.append((await reader.readexactly(size + 2))[:-2])
+    return args
+
+
+async def serve(host: str, port: int, maxmemory: int):
+    store = Store(maxmemory)
+
+    async def client(reader, writer):
+        try:
+            while True:
+                args = await read_command(reader)
+                if not args:
+                    break
+                writer.write(handle(store, args))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(client, host, port)
+    print(f"RESP stand-in on {host}:{port} (maxmemory {maxmemory} bytes)")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6379)
+    parser.add_argument("--maxmemory", type=int, default=64 * 1024 * 1024)
+    args = parser.parse_args()
+    asyncio.run(serve(args.host, args.port, args.maxmemory))
+
+
+if __name__ == "__main__":
+    main()
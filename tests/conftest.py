@@ -0,0 +1,10 @@
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+# tests build their own caches; importing the module must not open the
+# shared database in model_layer/data
+os.environ["ASKORA_SHARED_CACHE"] = "off"
@@ -0,0 +1,196 @@
+import asyncio
+import multiprocessing
+import socket
+import threading
+import time
+
+import pytest
+
+from model_layer.ai.shared_cache import RedisCache, SharedCache, SqliteCache, prompt_hash
+from model_layer.tools import resp_server
+
+PROCESSES = 6
+
+# =====================================================
+#                 FIXTURES
+# =====================================================
+
+@pytest.fixture
+def sqlite_path(tmp_path):
+    return tmp_path / "shared.sqlite3"
+
+
+@pytest.fixture(scope="module")
+def redis_url():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+
+    thread = threading.Thread(
+        target=asyncio.run,
+        args=(resp_server.serve("127.0.0.1", port, 0),),
+        daemon=True,
+    )
+    thread.start()
+
+    deadline = time.monotonic() + 5
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            break
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+    return f"redis://127.0.0.1:{port}/0"
+
+
+def _backend(kind: str, where):
+    if kind == "sqlite":
+        return SqliteCache(where)
+    backend = RedisCache(where)
+    # keys are per prompt; a fresh prefix keeps tests independent
+    backend.prefix = f"test:{time.monotonic_ns()}:"
+    return backend
+
+
+@pytest.fixture(params=["sqlite", "redis"])
+def backend(request, sqlite_path):
+    if request.param == "sqlite":
+        return _backend("sqlite", sqlite_path)
+    return _backend("redis", request.getfixturevalue("redis_url"))
+
+# =====================================================
+#                 ROUND TRIP
+# =====================================================
+
+def test_round_trip(backend):
+    assert backend.get("k") is None
+    backend.put("k", "نص عربي")
+    assert backend.get("k") == "نص عربي"
+    backend.put("k", "replaced")
+    assert backend.get("k") == "replaced"
+
+
+def test_lease_is_exclusive(backend):
+    assert backend.acquire("k", "a", 30)
+    assert not backend.acquire("k", "b", 30)
+    # only the owner releases
+    backend.release("k", "b")
+    assert not backend.acquire("k", "b", 30)
+    backend.release("k", "a")
+    assert backend.acquire("k", "b", 30)
+
+
+def test_expired_lease_is_taken_over(backend):
+    assert backend.acquire("k", "a", 0.05)
+    time.sleep(0.1)
+    assert backend.acquire("k", "b", 30)
+
+
+def test_only_accepted_answers_are_cached(backend):
+    cache = SharedCache(backend)
+    is_json = lambda t: t.startswith("{")
+
+    assert cache.get_or_generate("p", lambda: "not json", accept=is_json) == "not json"
+    assert backend.get(prompt_hash("p")) is None
+
+    assert cache.get_or_generate("p", lambda: "{}", accept=is_json) == "{}"
+    assert cache.get_or_generate("p", lambda: pytest.fail("not cached"), accept=is_json) == "{}"
+
+# =====================================================
+#                 SQLITE SIZE BOUND
+# =====================================================
+
+def _stored_bytes(cache: SqliteCache) -> int:
+    return cache._conn().execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+
+def test_sqlite_running_total_tracks_puts(sqlite_path):
+    cache = SqliteCache(sqlite_path, max_bytes=10_000)
+    cache.put("a", "x" * 100)
+    cache.put("b", "y" * 200)
+    cache.put("a", "z" * 50)
+    assert cache.stats()["bytes"] == _stored_bytes(cache) == 250
+
+
+def test_sqlite_evicts_least_recently_used(sqlite_path):
+    cache = SqliteCache(sqlite_path, max_bytes=1000)
+    for i in range(30):
+        cache.put(f"k{i}", "x" * 100)
+
+    stats = cache.stats()
+    assert stats["bytes"] == _stored_bytes(cache) <= 1000
+    assert cache.get("k29") is not None
+    assert cache.get("k0") is None
+
+
+def test_sqlite_total_survives_reopen(sqlite_path):
+    SqliteCache(sqlite_path).put("a", "x" * 123)
+    assert SqliteCache(sqlite_path).stats()["bytes"] == 123
+
+# =====================================================
+#                 STAMPEDE ACROSS PROCESSES
+# =====================================================
+
+def _generate_once(kind, where, prefix, counter, start, results):
+    backend = _backend(kind, where)
+    if prefix:
+        backend.prefix = prefix
+    cache = SharedCache(backend)
+
+    def generate():
+        with open(counter, "a") as f:
+            f.write("x\n")
+        time.sleep(0.5)
+        return "answer"
+
+    start.wait()
+    results.put(cache.get_or_generate("one cold prompt", generate))
+
+
+@pytest.mark.parametrize("kind", ["sqlite", "redis"])
+def test_one_generation_across_processes(kind, request, tmp_path):
+    if kind == "sqlite":
+        where, prefix = tmp_path / "shared.sqlite3", None
+        # create the schema once, as a running worker would have
+        SqliteCache(where)
+    else:
+        where = request.getfixturevalue("redis_url")
+        prefix = f"stampede:{time.monotonic_ns()}:"
+
+    ctx = multiprocessing.get_context("spawn")
+    counter = tmp_path / "calls"
+    start = ctx.Event()
+    results = ctx.Queue()
+    workers = [
+        ctx.Process(target=_generate_once, args=(kind, where, prefix, counter, start, results))
+        for _ in range(PROCESSES)
+    ]
+    for w in workers:
+        w.start()
+    # let every process import and connect before releasing them together
+    time.sleep(2)
+    start.set()
+
+    answers = [results.get(timeout=60) for _ in workers]
+    for w in workers:
+        w.join(timeout=60)
+        assert w.exitcode == 0
+
+    assert answers == ["answer"] * PROCESSES
+    assert counter.read_text().count("x") == 1
+
+# =====================================================
+#                 WAITER BOUND
+# =====================================================
+
+def test_waiters_beyond_the_bound_generate(sqlite_path):
+    backend = SqliteCache(sqlite_path)
+    cache = SharedCache(backend, max_waiters=0)
+    # another process holds the lease
+    assert backend.acquire(prompt_hash("p"), "someone-else", 30)
+
+    assert cache.get_or_generate("p", lambda: "direct") == "direct"
+    assert cache.stats()["wait_overflow"] == 1
+    assert cache.stats()["waiters"] == 0